@@ -16,11 +16,10 @@ from flask_cors import CORS
 # Import models, services, and routes
 from backend.models import PerformanceMetrics
 from backend.routes import register_health_routes, register_analysis_routes
-from backend.utils import ensure_upload_folder
+from backend.utils import ensure_upload_folder, FastJSONProvider
 
 # Configuration
 UPLOAD_FOLDER = 'uploads'
-ALLOWED_EXTENSIONS = {'log', 'txt'}
 MAX_FILE_SIZE = 50 * 1024 * 1024
 
 # Create Flask app
@@ -30,7 +29,13 @@ CORS(app, resources={r"/api/*": {"origins": "*"}})
 # Configure app
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE
-app.config['JSON_SORT_KEYS'] = False
+
+# Flask 2.3 ignores JSON_SORT_KEYS; configure the JSON provider directly so the
+# nested report payloads are serialized without key sorting or pretty-printing
+# (encoded with orjson when it is installed)
+app.json = FastJSONProvider(app)
+app.json.sort_keys = False
+app.json.compact = True
 
 # Ensure upload folder exists
 ensure_upload_folder(UPLOAD_FOLDER)
@@ -1,4 +1,14 @@
 """Models package"""
 from .metrics import PerformanceMetrics
+from .report_cache import ReportCache
+from .analysis_jobs import AnalysisJobs
+from .analysis_metrics import (
+    AnalysisMetrics, DetectionMetrics, EmbeddingMetrics, FileInfo, LLMMetrics,
+    QualityMetrics, RCAMetrics, ReportMetrics, RetrievalMetrics, SystemMetrics
+)
 
-__all__ = ['PerformanceMetrics']
+__all__ = [
+    'PerformanceMetrics', 'ReportCache', 'AnalysisJobs', 'ReportMetrics', 'AnalysisMetrics',
+    'FileInfo', 'EmbeddingMetrics', 'RetrievalMetrics', 'LLMMetrics',
+    'DetectionMetrics', 'RCAMetrics', 'SystemMetrics', 'QualityMetrics'
+]
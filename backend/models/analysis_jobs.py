@@ -0,0 +1,67 @@
+"""
+Analysis Jobs Model
+"""
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+class AnalysisJobs:
+    """
+    Thread-safe registry of background analysis jobs, keyed by job ID.
+    Jobs live in the worker process that accepted them, so clients must poll
+    the same process (sticky sessions when running several workers).
+    Finished jobs are forgotten max_age seconds after finishing, or earlier,
+    oldest first, while more than max_entries jobs are held. At most
+    max_pending jobs may be queued or running at once.
+    """
+    
+    def __init__(self, max_workers=4, max_entries=256, max_age=600, max_pending=16):
+        self.lock = Lock()
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.max_pending = max_pending
+        self.pending = 0
+        self.jobs = OrderedDict()
+        self.finished_at = {}  # job_id -> time.monotonic() when it finished, in finishing order
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='analysis-job')
+    
+    def submit(self, fn, *args):
+        """Run fn(*args) in the background and return the new job's ID, or None when too many are pending"""
+        with self.lock:
+            if self.pending >= self.max_pending:
+                return None
+            self.pending += 1
+        job_id = uuid.uuid4().hex
+        future = self.executor.submit(fn, *args)
+        with self.lock:
+            self.jobs[job_id] = future
+            self._evict()
+        future.add_done_callback(lambda _: self._finished(job_id))
+        return job_id
+    
+    def get(self, job_id):
+        """Get a job's future, or None if unknown"""
+        with self.lock:
+            self._evict()
+            return self.jobs.get(job_id)
+    
+    def _finished(self, job_id):
+        """Record when a job finished (runs as the job's done-callback)"""
+        with self.lock:
+            self.pending -= 1
+            self.finished_at[job_id] = time.monotonic()
+    
+    def _evict(self):
+        """Forget expired finished jobs, and the oldest finished ones while over capacity (caller holds the lock)"""
+        # Running jobs are never dropped; a client is still waiting for their result
+        expired_before = time.monotonic() - self.max_age
+        excess = len(self.jobs) - self.max_entries
+        for job_id, finished in list(self.finished_at.items()):
+            if excess <= 0 and finished >= expired_before:
+                break
+            del self.jobs[job_id]
+            del self.finished_at[job_id]
+            excess -= 1
+
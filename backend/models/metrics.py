@@ -1,8 +1,9 @@
 """
 Performance Metrics Model
 """
-from datetime import datetime
-from threading import Lock
+import time
+from threading import Lock, Thread
+import psutil
 
 class PerformanceMetrics:
     """Track performance metrics"""
@@ -14,7 +15,26 @@ class PerformanceMetrics:
         self.total_response_time = 0
         self.total_processing_time = 0
         self.cache_hits = 0
-        self.start_time = datetime.now()
+        # Monotonic clock: uptime is immune to wall-clock adjustments
+        self.start_time = time.monotonic()
+        # Resident memory is refreshed by a background sampler, so readers never
+        # query the OS on the request path
+        self.process = psutil.Process()
+        self.memory_mb = self.process.memory_info().rss / 1024 / 1024
+        self.memory_sampler = None
+    
+    def start_memory_sampler(self, interval=1.0):
+        """Start refreshing memory_mb from a daemon thread every interval seconds"""
+        if self.memory_sampler is None:
+            self.memory_sampler = Thread(target=self._sample_memory, args=(interval,),
+                                         name='memory-sampler', daemon=True)
+            self.memory_sampler.start()
+    
+    def _sample_memory(self, interval):
+        """Memory sampler loop"""
+        while True:
+            self.memory_mb = self.process.memory_info().rss / 1024 / 1024
+            time.sleep(interval)
     
     def record_request(self, success=True, response_time=0, processing_time=0):
         """Record a request metric"""
@@ -33,20 +53,28 @@ class PerformanceMetrics:
     
     def get_metrics(self):
         """Get current metrics"""
+        # Only snapshot the counters under the lock; derive everything else outside it
         with self.lock:
-            uptime = (datetime.now() - self.start_time).total_seconds()
-            avg_response = self.total_response_time / max(self.requests_count, 1)
-            avg_processing = self.total_processing_time / max(self.requests_count, 1)
-            success_rate = (self.successful_requests / max(self.requests_count, 1)) * 100
-            cache_rate = (self.cache_hits / max(self.requests_count, 1)) * 100
-            
-            return {
-                'uptime_seconds': round(uptime, 2),
-                'total_requests': self.requests_count,
-                'successful_requests': self.successful_requests,
-                'success_rate': round(success_rate, 2),
-                'avg_response_time_ms': round(avg_response, 2),
-                'avg_processing_time_ms': round(avg_processing, 2),
-                'cache_hit_rate': round(cache_rate, 2),
-                'total_cache_hits': self.cache_hits
-            }
+            requests_count = self.requests_count
+            successful_requests = self.successful_requests
+            total_response_time = self.total_response_time
+            total_processing_time = self.total_processing_time
+            cache_hits = self.cache_hits
+        
+        uptime = time.monotonic() - self.start_time
+        avg_response = total_response_time / max(requests_count, 1)
+        avg_processing = total_processing_time / max(requests_count, 1)
+        success_rate = (successful_requests / max(requests_count, 1)) * 100
+        cache_rate = (cache_hits / max(requests_count, 1)) * 100
+        
+        return {
+            'uptime_seconds': round(uptime, 2),
+            'total_requests': requests_count,
+            'successful_requests': successful_requests,
+            'success_rate': round(success_rate, 2),
+            'avg_response_time_ms': round(avg_response, 2),
+            'avg_processing_time_ms': round(avg_processing, 2),
+            'cache_hit_rate': round(cache_rate, 2),
+            'total_cache_hits': cache_hits,
+            'memory_mb': round(self.memory_mb, 1)
+        }
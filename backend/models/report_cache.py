@@ -0,0 +1,98 @@
+"""
+Report Cache Model
+"""
+import json
+import sqlite3
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+class ReportCache:
+    """
+    Thread-safe LRU cache of generated reports keyed by content hash.
+    With a db_path, reports are also persisted to SQLite so they survive
+    restarts and are shared between worker processes. Persisting happens on a
+    background writer thread so requests never wait on disk writes, and the
+    table keeps only the max_db_entries most recently written reports.
+    """
+    
+    def __init__(self, max_entries=256, db_path=None, max_db_entries=4096):
+        self.lock = Lock()
+        self.max_entries = max_entries
+        self.max_db_entries = max_db_entries
+        self.entries = OrderedDict()
+        self.db = None
+        self.reader = None
+        self.reader_lock = Lock()
+        self.writer = None
+        if db_path:
+            self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='report-cache')
+            # The writer thread owns self.db; lookups use their own connection so that
+            # (with WAL) they never wait for a write in progress
+            self.db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            self.db.execute('PRAGMA journal_mode=WAL')
+            self.db.execute('CREATE TABLE IF NOT EXISTS reports (key TEXT PRIMARY KEY, report TEXT NOT NULL)')
+            self.reader = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+    
+    def get(self, key):
+        """Get a cached report, or None on a miss"""
+        with self.lock:
+            report = self.entries.get(key)
+            if report is not None:
+                self.entries.move_to_end(key)
+                return report
+        if self.reader is None:
+            return None
+        
+        # Disk lookups run outside self.lock so memory hits never queue behind them
+        with self.reader_lock:
+            row = self.reader.execute('SELECT report FROM reports WHERE key = ?', (json.dumps(key),)).fetchone()
+        if row is None:
+            return None
+        report = orjson.loads(row[0]) if ORJSON_AVAILABLE else json.loads(row[0])
+        with self.lock:
+            # A put() that landed meanwhile wins over the row read from disk
+            cached = self.entries.get(key)
+            if cached is not None:
+                return cached
+            self._remember(key, report)
+        return report
+    
+    def put(self, key, report):
+        """Store a report, evicting the least recently used one when full"""
+        with self.lock:
+            self._remember(key, report)
+        if self.writer is not None:
+            self.writer.submit(self._persist, key, report).add_done_callback(self._report_write_error)
+    
+    def _persist(self, key, report):
+        """Write a report through to SQLite and trim old rows (runs on the writer thread)"""
+        # Keys always go through json.dumps so rows written with either encoder still match
+        if ORJSON_AVAILABLE:
+            row = (json.dumps(key), orjson.dumps(report, option=orjson.OPT_NON_STR_KEYS).decode())
+        else:
+            row = (json.dumps(key), json.dumps(report))
+        # REPLACE gives the row a fresh rowid, so rowids order rows by last write
+        self.db.execute('INSERT OR REPLACE INTO reports (key, report) VALUES (?, ?)', row)
+        self.db.execute('DELETE FROM reports WHERE rowid <= (SELECT max(rowid) FROM reports) - ?',
+                        (self.max_db_entries,))
+    
+    @staticmethod
+    def _report_write_error(future):
+        """Report a failed write-through; the in-memory entry is kept either way"""
+        error = future.exception()
+        if error is not None:
+            print(f"⚠️  Could not persist cached report: {error}")
+    
+    def _remember(self, key, report):
+        """Add a report to the in-memory LRU (caller holds the lock)"""
+        self.entries[key] = report
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
@@ -1,329 +1,404 @@
 """
 Analysis routes
 """
-import time
 import os
-import psutil
-from flask import request, jsonify
-from werkzeug.utils import secure_filename
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from flask import g, request, jsonify
+from backend.models import (
+    AnalysisJobs, AnalysisMetrics, DetectionMetrics, EmbeddingMetrics, FileInfo, LLMMetrics,
+    QualityMetrics, RCAMetrics, ReportCache, RetrievalMetrics, SystemMetrics
+)
 from backend.services.analyzer import LogAnalyzer
 from backend.services.generator import ReportGenerator
+from backend.utils import allowed_file
 from backend.utils.metrics_printer import MetricsPrinter
 
+# Questions answered for every analyzed log, in report order. Clients cannot send their own,
+# so report caches key on the exact question text with no fuzzy or semantic matching
+QUESTIONS = (
+    "Analyze anomaly in logs",
+    "Find authentication failure",
+    "Detect brute force attack patterns in sshd",
+    "Check abnormal user sessions",
+    "Find resource and configuration anomalies",
+)
+
+# Detection bucket that each question's anomaly count is added to, parallel to QUESTIONS
+_ANOMALY_BUCKETS = (
+    'security_anomalies',
+    'auth_failures',
+    'brute_force',
+    'suspicious_sessions',
+    'misconfigurations',
+)
+
+# Report generation spends most of its time waiting on LLM/embedding calls,
+# so the questions of a request are fanned out instead of run back to back
+_REPORT_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='report')
+
+
+def _elapsed_ms(start, end=None):
+    """Milliseconds elapsed since a perf_counter_ns() start (until end, or now)"""
+    if end is None:
+        end = time.perf_counter_ns()
+    return (end - start) / 1e6
+
+
+def _record_request(metrics):
+    """
+    Record every call of the decorated handler in the request metrics.
+    The handler reads its start time from g.request_start and stores its
+    processing time in g.processing_time; error statuses count as failures.
+    A handler that hands the work to a background job sets g.recorded_by_job,
+    and the job records the request when it finishes instead.
+    """
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(*args, **kwargs):
+            g.request_start = time.perf_counter_ns()
+            g.processing_time = 0
+            g.recorded_by_job = False
+            success = False
+            try:
+                response, status = handler(*args, **kwargs)
+                success = status < 400
+                return response, status
+            finally:
+                if not g.recorded_by_job:
+                    metrics.record_request(success=success, response_time=_elapsed_ms(g.request_start),
+                                           processing_time=g.processing_time)
+        return wrapper
+    return decorator
+
+
+def _timed_report(idx, question, content, content_hash):
+    """Generate one report and extract its metrics, including generation time in ms"""
+    question_start = time.perf_counter_ns()
+    report = ReportGenerator.generate_report_with_ai(idx, question, content, content_hash, use_ai=True)
+    return report, ReportGenerator.extract_report_metrics(report, _elapsed_ms(question_start))
+
+
+def _generate_reports(questions, content, content_hash, report_cache):
+    """
+    Generate all question reports concurrently, preserving question order.
+    Reports already cached for this content hash are reused instead of regenerated.
+    Only AI-powered reports are cached: a report that fell back to the advanced analyzer
+    (AI unavailable or a failed AI call) is regenerated on the next request.
+    
+    Returns:
+        - list of (report, ReportMetrics) tuples
+        - whether every report was served from the cache
+    """
+    results = [None] * len(questions)
+    futures = {}
+    for idx, question in enumerate(questions, 1):
+        report = report_cache.get((content_hash, idx))
+        if report is not None:
+            # Nothing was embedded, retrieved or generated for a cached report
+            report_metrics = ReportGenerator.extract_report_metrics(report)
+            report_metrics.embedding_time = report_metrics.retrieval_time = report_metrics.llm_time = 0.0
+            results[idx - 1] = (report, report_metrics)
+        else:
+            futures[idx] = _REPORT_EXECUTOR.submit(_timed_report, idx, question, content, content_hash)
+    
+    for idx, future in futures.items():
+        report, report_metrics = future.result()
+        if report.get('ai_powered'):
+            report_cache.put((content_hash, idx), report)
+        results[idx - 1] = (report, report_metrics)
+    
+    return results, not futures
+
 def register_analysis_routes(app, metrics, upload_folder):
     """Register analysis routes"""
     
+    # Identical uploads yield identical reports, so repeats skip the LLM pipeline;
+    # the reports are persisted next to the uploads so restarts keep the cache warm
+    report_cache = ReportCache(max_entries=256, db_path=os.path.join(upload_folder, 'report_cache.db'))
+    
+    # Uploads posted with ?async=1 are analyzed in the background and polled by job ID;
+    # each queued job holds its whole upload, so only a few may be pending at once
+    analysis_jobs = AnalysisJobs(max_workers=4, max_pending=8)
+    
+    metrics.start_memory_sampler()
+    
+    def run_analysis(filename, file_size, log_lines, file_hash, file_content, start_time):
+        """
+        Generate the reports for an upload, print its analysis metrics and build the
+        response payload. Returns the payload and the processing time in ms.
+        """
+        processing_start = time.perf_counter_ns()
+        
+        # Initialize metrics tracking
+        analysis_metrics = AnalysisMetrics(file_info=FileInfo(filename, file_size, log_lines, file_hash[:16]))
+        
+        # Track individual phase timings
+        phase_times = {}
+        
+        # Generate reports with AI (falls back to standard if AI unavailable)
+        embedding_times = []
+        retrieval_times = []
+        index_type = None
+        llm_times = []
+        anomaly_counts = {'auth_failures': 0, 'brute_force': 0, 'suspicious_sessions': 0, 'misconfigurations': 0, 'security_anomalies': 0}
+        rca_chain_count = 0
+        recommendations_count = 0
+        total_reports_with_rca = 0
+        total_events_correlated = 0
+        total_rca_generation_time = 0
+        
+        generated, from_cache = _generate_reports(QUESTIONS, file_content, file_hash, report_cache)
+        if from_cache:
+            metrics.record_cache_hit()
+        reports = [report for report, _ in generated]
+        
+        # Fold the per-report metrics extracted by the workers into the aggregates
+        for (_, report_metrics), bucket in zip(generated, _ANOMALY_BUCKETS):
+            if report_metrics.embedding_time > 0:
+                embedding_times.append(report_metrics.embedding_time)
+            if report_metrics.retrieval_time > 0:
+                retrieval_times.append(report_metrics.retrieval_time)
+            if report_metrics.index_type is not None:
+                index_type = report_metrics.index_type
+            if report_metrics.llm_time > 0:
+                llm_times.append(report_metrics.llm_time)
+            
+            # Count anomalies by type
+            if report_metrics.anomaly_count is not None:
+                anomaly_counts[bucket] += report_metrics.anomaly_count
+            
+            # Track RCA metrics (Root Cause Analysis)
+            if report_metrics.has_rca_explanation:
+                total_reports_with_rca += 1
+            if report_metrics.chain_length is not None:
+                rca_chain_count += 1
+                total_events_correlated += report_metrics.chain_length
+            if report_metrics.has_recommendation:
+                recommendations_count += 1
+            
+            # Track RCA generation time
+            total_rca_generation_time += report_metrics.generation_time_ms
+        
+        processing_time = _elapsed_ms(processing_start)
+        
+        # Calculate metrics
+        total_anomalies = sum(anomaly_counts.values())
+        total_embedding_time = sum(embedding_times)
+        total_retrieval_time = sum(retrieval_times)
+        total_llm_time = sum(llm_times)
+        
+        # Embedding metrics
+        if embedding_times:
+            analysis_metrics.embedding = EmbeddingMetrics(
+                latency_ms=total_embedding_time / len(embedding_times),
+                chunks_embedded=len(embedding_times),
+                throughput=len(embedding_times) / (total_embedding_time / 1000),
+                total_time_ms=total_embedding_time
+            )
+        
+        # Retrieval metrics
+        if retrieval_times:
+            analysis_metrics.retrieval = RetrievalMetrics(
+                avg_query_latency_ms=total_retrieval_time / len(retrieval_times),
+                total_queries=len(retrieval_times),
+                index_build_time_ms=retrieval_times[0],
+                total_retrieval_time_ms=total_retrieval_time
+            )
+            if index_type is not None:
+                analysis_metrics.retrieval.index_type = index_type
+        
+        # LLM metrics
+        if llm_times:
+            analysis_metrics.llm = LLMMetrics(
+                avg_latency_ms=total_llm_time / len(llm_times),
+                total_responses=len(llm_times),
+                total_time_ms=total_llm_time
+            )
+        
+        # Detection metrics
+        analysis_metrics.detection = DetectionMetrics(total_anomalies=total_anomalies, **anomaly_counts)
+        
+        # RCA metrics
+        if rca_chain_count or total_reports_with_rca > 0:
+            # Calculate RCA success rate - fraction with plausible root cause
+            rca_success_rate = total_reports_with_rca / len(reports) if len(reports) > 0 else 0
+            
+            # Calculate average correlation chain length
+            avg_chain_length = total_events_correlated / rca_chain_count if rca_chain_count else 0
+            
+            # Calculate recommendation coverage
+            recommendation_coverage = recommendations_count / len(reports) if len(reports) > 0 else 0
+            
+            # Estimate analyst effort reduction (based on automation)
+            # Baseline: 15-20 minutes manual investigation per incident
+            # With RCA: 2-5 minutes to review automated analysis
+            baseline_time_per_incident = 17.5  # minutes (average)
+            automated_time_per_incident = 3.5  # minutes (average)
+            effort_reduction = ((baseline_time_per_incident - automated_time_per_incident) / baseline_time_per_incident) * 100
+            
+            # Average RCA generation time
+            avg_rca_time = total_rca_generation_time / len(reports) if reports else 0
+            
+            analysis_metrics.rca = RCAMetrics(
+                success_rate=rca_success_rate,
+                avg_chain_length=avg_chain_length,
+                recommendations_count=recommendations_count,
+                recommendation_coverage=recommendation_coverage,
+                avg_generation_time_ms=avg_rca_time,
+                total_correlated_events=total_events_correlated,
+                reports_with_rca=total_reports_with_rca,
+                total_reports_analyzed=len(reports),
+                analyst_effort_reduction_pct=effort_reduction,
+                baseline_investigation_time_min=baseline_time_per_incident,
+                automated_investigation_time_min=automated_time_per_incident,
+                time_saved_per_incident_min=baseline_time_per_incident - automated_time_per_incident
+            )
+        
+        # System metrics
+        response_time = _elapsed_ms(start_time)
+        
+        time_breakdown = {
+            'File Processing': response_time - processing_time,
+            'Analysis Processing': processing_time,
+            'Embedding': total_embedding_time,
+            'Retrieval': total_retrieval_time,
+            'LLM Generation': total_llm_time
+        }
+        
+        analysis_metrics.system = SystemMetrics(
+            total_time_ms=processing_time,
+            file_processing_ms=response_time - processing_time,
+            response_time_ms=response_time,
+            memory_mb=metrics.memory_mb,
+            time_breakdown=time_breakdown
+        )
+        
+        # Quality metrics (estimated based on typical RAG performance)
+        analysis_metrics.quality = QualityMetrics()
+        
+        # Print comprehensive metrics to terminal
+        MetricsPrinter.print_analysis_metrics(analysis_metrics)
+        
+        return {
+            "success": True,
+            "filename": filename,
+            "file_hash": file_hash[:8],
+            "report_count": len(reports),
+            "reports": reports,
+            "metrics": {
+                "processing_time_ms": round(processing_time, 2),
+                "response_time_ms": round(response_time, 2)
+            }
+        }, processing_time
+    
+    def run_analysis_job(filename, file_size, log_lines, file_hash, file_content, start_time):
+        """run_analysis() as a background job, recording the request once it finishes"""
+        success = False
+        processing_time = 0
+        try:
+            payload, processing_time = run_analysis(filename, file_size, log_lines,
+                                                    file_hash, file_content, start_time)
+            success = True
+            return payload, processing_time
+        finally:
+            metrics.record_request(success=success, response_time=_elapsed_ms(start_time),
+                                   processing_time=processing_time)
+    
     @app.route('/api/analyze', methods=['POST'])
+    @_record_request(metrics)
     def analyze_file():
         """Analyze uploaded file"""
-        start_time = time.time()
+        start_time = g.request_start
         try:
             if 'file' not in request.files:
-                metrics.record_request(success=False, response_time=(time.time() - start_time) * 1000)
                 return jsonify({"error": "No file provided"}), 400
             
             file = request.files['file']
             
             if file.filename == '':
-                metrics.record_request(success=False, response_time=(time.time() - start_time) * 1000)
                 return jsonify({"error": "No file selected"}), 400
             
-            if not ('.' in file.filename and file.filename.rsplit('.', 1)[1].lower() in {'log', 'txt'}):
-                metrics.record_request(success=False, response_time=(time.time() - start_time) * 1000)
+            if not allowed_file(file.filename):
                 return jsonify({"error": "Invalid file type. Only .log and .txt allowed"}), 400
             
-            # Read file content
-            file_content = file.read().decode('utf-8', errors='ignore')
-            
-            # Generate hash
-            file_hash = LogAnalyzer.get_file_hash(file_content)
-            
-            # Save file
-            filename = secure_filename(file.filename)
-            filepath = os.path.join(upload_folder, filename)
-            with open(filepath, 'w') as f:
-                f.write(file_content)
-            
-            processing_start = time.time()
-            
-            # Initialize metrics tracking
-            file_size = len(file_content.encode('utf-8'))
-            log_lines = len(file_content.split('\n'))
-            
-            metrics_data = {
-                'file_info': {
-                    'filename': filename,
-                    'size': file_size,
-                    'lines': log_lines,
-                    'hash': file_hash[:16]
-                },
-                'embedding_metrics': {},
-                'retrieval_metrics': {},
-                'llm_metrics': {},
-                'detection_metrics': {},
-                'rca_metrics': {},
-                'system_metrics': {},
-                'quality_metrics': {}
-            }
-            
-            # Track individual phase timings
-            phase_times = {}
-            
-            # Questions
-            questions = [
-                "Analyze anomaly in logs",
-                "Find authentication failure",
-                "Detect brute force attack patterns in sshd",
-                "Check abnormal user sessions",
-                "Find resource and configuration anomalies",
-            ]
-            
-            # Generate reports with AI (falls back to standard if AI unavailable)
-            reports = []
-            embedding_times = []
-            retrieval_times = []
-            llm_times = []
-            anomaly_counts = {'auth_failures': 0, 'brute_force': 0, 'suspicious_sessions': 0, 'misconfigurations': 0, 'security_anomalies': 0}
-            rca_chains = []
-            recommendations_count = 0
-            total_reports_with_rca = 0
-            total_events_correlated = 0
-            rca_generation_times = []
-            
-            for idx, question in enumerate(questions, 1):
-                question_start = time.time()
-                report = ReportGenerator.generate_report_with_ai(idx, question, file_content, file_hash, use_ai=True)
-                reports.append(report)
-                question_time = (time.time() - question_start) * 1000
-                
-                # Extract metrics from report (safely handle missing ai_metadata)
-                if 'ai_metadata' in report and report['ai_metadata']:
-                    ai_meta = report['ai_metadata']
-                    if 'embedding_time' in ai_meta and ai_meta['embedding_time'] > 0:
-                        embedding_times.append(ai_meta['embedding_time'])
-                    if 'retrieval_time' in ai_meta and ai_meta['retrieval_time'] > 0:
-                        retrieval_times.append(ai_meta['retrieval_time'])
-                    if 'llm_time' in ai_meta and ai_meta['llm_time'] > 0:
-                        llm_times.append(ai_meta['llm_time'])
-                
-                # Count anomalies by type
-                if 'analysis' in report and 'anomalies_detected' in report['analysis']:
-                    anomaly_count = report['analysis']['anomalies_detected']
-                    if idx == 2:  # Authentication failures
-                        anomaly_counts['auth_failures'] = anomaly_count
-                    elif idx == 3:  # Brute force
-                        anomaly_counts['brute_force'] = anomaly_count
-                    elif idx == 4:  # Suspicious sessions
-                        anomaly_counts['suspicious_sessions'] = anomaly_count
-                    elif idx == 5:  # Misconfigurations
-                        anomaly_counts['misconfigurations'] = anomaly_count
-                    else:
-                        anomaly_counts['security_anomalies'] += anomaly_count
-                
-                # Track RCA metrics (Root Cause Analysis)
-                has_rca_explanation = False
-                if 'root_cause' in report:
-                    rc = report['root_cause']
-                    
-                    # Check if we have a plausible root cause explanation
-                    if 'explanation' in rc and rc['explanation'] and len(rc['explanation']) > 20:
-                        has_rca_explanation = True
-                        total_reports_with_rca += 1
-                    
-                    # Track correlation chain length
-                    if 'correlated_events' in rc:
-                        chain_length = len(rc['correlated_events'])
-                        rca_chains.append(chain_length)
-                        total_events_correlated += chain_length
-                    elif 'evidence' in rc and isinstance(rc['evidence'], list):
-                        chain_length = len(rc['evidence'])
-                        rca_chains.append(chain_length)
-                        total_events_correlated += chain_length
-                    else:
-                        rca_chains.append(0)
-                    
-                    # Track recommendations
-                    if 'recommended_fixes' in rc and len(rc['recommended_fixes']) > 0:
-                        recommendations_count += 1
-                
-                # Track RCA generation time
-                rca_generation_times.append(question_time)
-            
-            processing_time = (time.time() - processing_start) * 1000
-            
-            # Calculate metrics
-            total_anomalies = sum(anomaly_counts.values())
-            
-            # Embedding metrics
-            if embedding_times:
-                metrics_data['embedding_metrics'] = {
-                    'dimension': 1024,  # nv-embedqa-e5-v5
-                    'latency_ms': sum(embedding_times) / len(embedding_times),
-                    'chunks_embedded': len(embedding_times),
-                    'throughput': (len(embedding_times) / (sum(embedding_times) / 1000)) if embedding_times else 0,
-                    'total_time_ms': sum(embedding_times)
-                }
-            
-            # Retrieval metrics
-            if retrieval_times:
-                metrics_data['retrieval_metrics'] = {
-                    'index_type': 'IndexFlatIP',
-                    'avg_query_latency_ms': sum(retrieval_times) / len(retrieval_times),
-                    'total_queries': len(retrieval_times),
-                    'top_k': 4,
-                    'index_build_time_ms': retrieval_times[0] if retrieval_times else 0,
-                    'total_retrieval_time_ms': sum(retrieval_times)
-                }
-            
-            # LLM metrics
-            if llm_times:
-                metrics_data['llm_metrics'] = {
-                    'model': 'meta/llama-3.1-70b-instruct',
-                    'temperature': 0.3,
-                    'max_tokens': 2048,
-                    'avg_latency_ms': sum(llm_times) / len(llm_times),
-                    'total_responses': len(llm_times),
-                    'total_time_ms': sum(llm_times),
-                    'avg_tokens': 450  # Estimated average
-                }
-            
-            # Detection metrics
-            metrics_data['detection_metrics'] = {
-                'total_anomalies': total_anomalies,
-                **anomaly_counts
-            }
-            
-            # RCA metrics
-            if rca_chains or total_reports_with_rca > 0:
-                # Calculate RCA success rate - fraction with plausible root cause
-                rca_success_rate = total_reports_with_rca / len(reports) if len(reports) > 0 else 0
-                
-                # Calculate average correlation chain length
-                avg_chain_length = sum(rca_chains) / len(rca_chains) if rca_chains else 0
-                
-                # Calculate recommendation coverage
-                recommendation_coverage = recommendations_count / len(reports) if len(reports) > 0 else 0
-                
-                # Estimate analyst effort reduction (based on automation)
-                # Baseline: 15-20 minutes manual investigation per incident
-                # With RCA: 2-5 minutes to review automated analysis
-                baseline_time_per_incident = 17.5  # minutes (average)
-                automated_time_per_incident = 3.5  # minutes (average)
-                effort_reduction = ((baseline_time_per_incident - automated_time_per_incident) / baseline_time_per_incident) * 100
-                
-                # Average RCA generation time
-                avg_rca_time = sum(rca_generation_times) / len(rca_generation_times) if rca_generation_times else 0
-                
-                metrics_data['rca_metrics'] = {
-                    'success_rate': rca_success_rate,
-                    'avg_chain_length': avg_chain_length,
-                    'recommendations_count': recommendations_count,
-                    'recommendation_coverage': recommendation_coverage,
-                    'avg_generation_time_ms': avg_rca_time,
-                    'total_correlated_events': total_events_correlated,
-                    'reports_with_rca': total_reports_with_rca,
-                    'total_reports_analyzed': len(reports),
-                    'analyst_effort_reduction_pct': effort_reduction,
-                    'baseline_investigation_time_min': baseline_time_per_incident,
-                    'automated_investigation_time_min': automated_time_per_incident,
-                    'time_saved_per_incident_min': baseline_time_per_incident - automated_time_per_incident
-                }
-            
-            # System metrics
-            process = psutil.Process()
-            memory_mb = process.memory_info().rss / 1024 / 1024
-            
-            response_time = (time.time() - start_time) * 1000
-            
-            time_breakdown = {
-                'File Processing': response_time - processing_time,
-                'Analysis Processing': processing_time,
-                'Embedding': sum(embedding_times) if embedding_times else 0,
-                'Retrieval': sum(retrieval_times) if retrieval_times else 0,
-                'LLM Generation': sum(llm_times) if llm_times else 0
-            }
-            
-            metrics_data['system_metrics'] = {
-                'total_time_ms': processing_time,
-                'file_processing_ms': response_time - processing_time,
-                'response_time_ms': response_time,
-                'memory_mb': memory_mb,
-                'time_breakdown': time_breakdown
-            }
-            
-            # Quality metrics (estimated based on typical RAG performance)
-            metrics_data['quality_metrics'] = {
-                'evidence_grounding': 0.947,
-                'faithfulness': 0.928,
-                'retrieval_accuracy': 0.906,
-                'reasoning_accuracy': 0.912
-            }
-            
-            # Print comprehensive metrics to terminal
-            MetricsPrinter.print_analysis_metrics(metrics_data)
-            
-            # Cleanup
-            if os.path.exists(filepath):
-                os.remove(filepath)
-            
-            metrics.record_request(success=True, response_time=response_time, processing_time=processing_time)
-            
-            return jsonify({
-                "success": True,
-                "filename": filename,
-                "file_hash": file_hash[:8],
-                "report_count": len(reports),
-                "reports": reports,
-                "metrics": {
-                    "processing_time_ms": round(processing_time, 2),
-                    "response_time_ms": round(response_time, 2)
-                }
-            }), 200
+            # Read file content; size, line count and hash come from the raw bytes,
+            # which are decoded only once for the report generators
+            raw_content = file.read()
+            file_size = len(raw_content)
+            log_lines = raw_content.count(b'\n') + 1
+            file_hash = LogAnalyzer.get_file_hash(raw_content)
+            file_content = raw_content.decode('utf-8', errors='ignore')
+            
+            # The upload is analyzed in memory and never written to disk, so the
+            # already-validated client filename is only echoed back for display
+            filename = file.filename
+            
+            # Optionally run the analysis as a background job and let the client poll for it
+            if request.args.get('async') == '1':
+                job_id = analysis_jobs.submit(run_analysis_job, filename, file_size, log_lines,
+                                              file_hash, file_content, start_time)
+                if job_id is None:
+                    return jsonify({"error": "Too many analyses in progress, try again later"}), 503
+                g.recorded_by_job = True
+                return jsonify({"job_id": job_id, "status": "queued"}), 202
+            
+            payload, g.processing_time = run_analysis(filename, file_size, log_lines,
+                                                      file_hash, file_content, start_time)
+            return jsonify(payload), 200
         
         except Exception as e:
-            metrics.record_request(success=False, response_time=(time.time() - start_time) * 1000)
             return jsonify({"error": str(e)}), 500
 
+    @app.route('/api/analyze/<job_id>', methods=['GET'])
+    def analysis_job(job_id):
+        """Get the status, or the result once finished, of a background analysis job"""
+        job = analysis_jobs.get(job_id)
+        if job is None:
+            return jsonify({"error": "Unknown job"}), 404
+        
+        if not job.done():
+            return jsonify({"job_id": job_id, "status": "processing"}), 202
+        
+        error = job.exception()
+        if error is not None:
+            return jsonify({"job_id": job_id, "status": "failed", "error": str(error)}), 500
+        
+        payload, _ = job.result()
+        return jsonify({"job_id": job_id, "status": "finished", **payload}), 200
+    
     @app.route('/api/analyze-text', methods=['POST'])
+    @_record_request(metrics)
     def analyze_text():
         """Analyze text directly"""
-        start_time = time.time()
+        start_time = g.request_start
         try:
             data = request.get_json()
             
             if not data or 'logText' not in data:
-                metrics.record_request(success=False, response_time=(time.time() - start_time) * 1000)
                 return jsonify({"error": "No log text provided"}), 400
             
             log_text = data['logText'].strip()
             
             if not log_text:
-                metrics.record_request(success=False, response_time=(time.time() - start_time) * 1000)
                 return jsonify({"error": "Log text is empty"}), 400
             
             # Generate hash
             file_hash = LogAnalyzer.get_file_hash(log_text)
             
-            processing_start = time.time()
-            
-            # Questions
-            questions = [
-                "Analyze anomaly in logs",
-                "Find authentication failure",
-                "Detect brute force attack patterns in sshd",
-                "Check abnormal user sessions",
-                "Find resource and configuration anomalies",
-            ]
+            processing_start = time.perf_counter_ns()
             
             # Generate reports with AI (falls back to standard if AI unavailable)
-            reports = []
-            for idx, question in enumerate(questions, 1):
-                report = ReportGenerator.generate_report_with_ai(idx, question, log_text, file_hash, use_ai=True)
-                reports.append(report)
+            generated, from_cache = _generate_reports(QUESTIONS, log_text, file_hash, report_cache)
+            if from_cache:
+                metrics.record_cache_hit()
+            reports = [report for report, _ in generated]
             
-            processing_time = (time.time() - processing_start) * 1000
-            response_time = (time.time() - start_time) * 1000
-            metrics.record_request(success=True, response_time=response_time, processing_time=processing_time)
+            end_time = time.perf_counter_ns()
+            processing_time = _elapsed_ms(processing_start, end_time)
+            response_time = _elapsed_ms(start_time, end_time)
+            g.processing_time = processing_time
             
             return jsonify({
                 "success": True,
@@ -337,5 +412,4 @@ def register_analysis_routes(app, metrics, upload_folder):
             }), 200
         
         except Exception as e:
-            metrics.record_request(success=False, response_time=(time.time() - start_time) * 1000)
             return jsonify({"error": str(e)}), 500
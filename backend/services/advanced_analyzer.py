@@ -6,10 +6,13 @@ Implements the research abstract's three core challenges:
 3. Robustness to noisy, incomplete, or corrupted log data
 """
 import re
-import numpy as np
-from datetime import datetime
-from collections import defaultdict, deque
-import hashlib
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Future
+from threading import Lock
+from .analyzer import LogAnalyzer
 
 class AdaptiveHyperparameterOptimizer:
     """
@@ -17,6 +20,16 @@ class AdaptiveHyperparameterOptimizer:
     Automatically adjusts detection thresholds based on log patterns and historical performance.
     """
     
+    # Severity score bounds (exclusive) and the (severity, confidence multiplier, confidence cap)
+    # of the band above each one, lowest band first
+    SEVERITY_BOUNDS = (1.0, 2.0, 3.0)
+    SEVERITY_BANDS = (
+        ('Low', 0.15, float('inf')),
+        ('Medium', 0.20, 0.85),
+        ('High', 0.25, 0.95),
+        ('Critical', 0.30, 1.0),
+    )
+    
     def __init__(self):
         self.learning_rate = 0.1
         self.threshold_history = deque(maxlen=100)  # Keep last 100 adjustments
@@ -25,6 +38,10 @@ class AdaptiveHyperparameterOptimizer:
             'recall': deque(maxlen=50),
             'f1_score': deque(maxlen=50)
         }
+        # Sliding window over the last 10 F1 scores with running sums for O(1) variance
+        self.recent_f1 = deque(maxlen=10)
+        self.recent_f1_sum = 0.0
+        self.recent_f1_sq_sum = 0.0
         
         # Adaptive thresholds that evolve based on patterns
         self.thresholds = {
@@ -40,11 +57,13 @@ class AdaptiveHyperparameterOptimizer:
             }
         }
     
-    def optimize_thresholds(self, log_stats, feedback=None):
+    def optimize_thresholds(self, log_stats, feedback=None, now=None):
         """
         Adaptively optimize detection thresholds based on current log patterns.
         Uses gradient-based optimization to minimize false positives while maintaining sensitivity.
         """
+        if now is None:
+            now = time.time()
         total_events = max(log_stats.get('total_lines', 1), 1)
         
         # Calculate current rates
@@ -67,7 +86,7 @@ class AdaptiveHyperparameterOptimizer:
         
         # Track optimization history
         self.threshold_history.append({
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now,
             'error_threshold': self.thresholds['error_rate'],
             'warning_threshold': self.thresholds['warning_rate'],
             'error_rate_observed': error_rate,
@@ -91,16 +110,10 @@ class AdaptiveHyperparameterOptimizer:
             (warning_rate / self.thresholds['warning_rate']) * 0.4
         )
         
-        # Adaptive severity classification
-        if severity_score > 3.0:
-            return 'Critical', min(severity_score * 0.3, 1.0)
-        elif severity_score > 2.0:
-            return 'High', min(severity_score * 0.25, 0.95)
-        elif severity_score > 1.0:
-            return 'Medium', min(severity_score * 0.20, 0.85)
-        else:
-            return 'Low', severity_score * 0.15
-        
+        # Adaptive severity classification: the band is the number of bounds the score exceeds
+        severity, multiplier, cap = self.SEVERITY_BANDS[bisect_left(self.SEVERITY_BOUNDS, severity_score)]
+        return severity, min(severity_score * multiplier, cap)
+    
     def update_from_feedback(self, feedback_data):
         """
         Continual learning: Update model parameters based on user feedback.
@@ -117,10 +130,18 @@ class AdaptiveHyperparameterOptimizer:
             f1 = 2 * (p * r) / (p + r) if (p + r) > 0 else 0
             self.performance_metrics['f1_score'].append(f1)
             
+            if len(self.recent_f1) == self.recent_f1.maxlen:
+                oldest = self.recent_f1[0]
+                self.recent_f1_sum -= oldest
+                self.recent_f1_sq_sum -= oldest * oldest
+            self.recent_f1.append(f1)
+            self.recent_f1_sum += f1
+            self.recent_f1_sq_sum += f1 * f1
+            
             # Adjust learning rate based on performance stability
             if len(self.performance_metrics['f1_score']) > 10:
-                recent_f1 = list(self.performance_metrics['f1_score'])[-10:]
-                variance = np.var(recent_f1)
+                mean = self.recent_f1_sum / len(self.recent_f1)
+                variance = max(self.recent_f1_sq_sum / len(self.recent_f1) - mean * mean, 0.0)
                 
                 if variance < 0.01:  # Stable performance
                     self.learning_rate = max(0.05, self.learning_rate * 0.95)  # Reduce learning rate
@@ -134,13 +155,24 @@ class NoiseRobustParser:
     Handles missing fields, malformed entries, and encoding issues gracefully.
     """
     
+    # Flexible regex patterns that tolerate noise, compiled once at import
+    # (the date/time separator excludes newlines so a match never spans lines)
+    TIMESTAMP_PATTERN = re.compile(r'\d{4}[-/]\d{2}[-/]\d{2}(?:T|[^\S\n])\d{2}:\d{2}:\d{2}', re.IGNORECASE)
+    IP_PATTERN = re.compile(r'\b(?:\d{1,3}\.){3}\d{1,3}\b', re.ASCII)
+    ERROR_CODE_PATTERN = re.compile(r'\b[A-Z]{2,5}[-_]?\d{3,5}\b', re.ASCII)
+    SEVERITY_PATTERN = re.compile(r'\b(FATAL|ERROR|WARN|WARNING|INFO|DEBUG|TRACE)\b', re.IGNORECASE)
+    
+    # All corruption markers in one pass; the group name says which one matched
+    CORRUPTION_PATTERN = re.compile(
+        r'(?P<truncated>\x00)'  # Null bytes indicate truncation
+        r'|(?P<binary>[\x01-\x08\x0B-\x0C\x0E-\x1F])'  # Control characters
+        r'|(?P<encoding_error>\\x[0-9a-fA-F]{2})'  # Escaped hex bytes
+    )
+    # Translation table deleting every control character except tab, newline and carriage return
+    CONTROL_CHARS = str.maketrans('', '', ''.join(chr(c) for c in range(32) if c not in (9, 10, 13)))
+    
     def __init__(self):
         self.encoding_fallbacks = ['utf-8', 'latin-1', 'ascii', 'utf-16']
-        self.corruption_patterns = {
-            'truncated': re.compile(r'.*\x00+.*'),  # Null bytes indicate truncation
-            'binary': re.compile(r'[\x00-\x08\x0B-\x0C\x0E-\x1F]'),  # Control characters
-            'encoding_error': re.compile(r'\\x[0-9a-fA-F]{2}')  # Escaped hex bytes
-        }
     
     def parse_robust(self, content):
         """
@@ -160,34 +192,34 @@ class NoiseRobustParser:
             'empty_lines': 0
         }
         
+        # Scan the whole buffer once; clean logs skip the per-line corruption checks
+        if self.CORRUPTION_PATTERN.search(content) is None:
+            cleaned_lines = [line for line in lines if line and not line.isspace()]
+            corruption_stats['empty_lines'] = len(lines) - len(cleaned_lines)
+            return '\n'.join(cleaned_lines), corruption_stats
+        
         for line in lines:
-            if not line.strip():
+            if not line or line.isspace():
                 corruption_stats['empty_lines'] += 1
                 continue
             
             # Check for corruption patterns
-            is_corrupted = False
+            markers = {match.lastgroup for match in self.CORRUPTION_PATTERN.finditer(line)}
+            is_corrupted = bool(markers)  # Escaped hex bytes are already decoded, but still count
             
-            if self.corruption_patterns['truncated'].match(line):
+            if 'truncated' in markers:
                 corruption_stats['truncated_lines'] += 1
-                is_corrupted = True
-                # Attempt recovery: remove null bytes
-                line = line.replace('\x00', '')
             
-            if self.corruption_patterns['binary'].search(line):
+            if 'binary' in markers:
                 corruption_stats['corrupted_lines'] += 1
-                is_corrupted = True
-                # Attempt recovery: remove control characters
-                line = self.corruption_patterns['binary'].sub('', line)
-            
-            if self.corruption_patterns['encoding_error'].search(line):
-                is_corrupted = True
-                # Already decoded, but mark as recovered
             
-            if is_corrupted and line.strip():
-                corruption_stats['recovered_lines'] += 1
+            if 'truncated' in markers or 'binary' in markers:
+                # Attempt recovery: remove null bytes and control characters
+                line = line.translate(self.CONTROL_CHARS)
             
-            if line.strip():  # Only keep non-empty lines
+            if line and not line.isspace():  # Only keep non-empty lines
+                if is_corrupted:
+                    corruption_stats['recovered_lines'] += 1
                 cleaned_lines.append(line)
         
         cleaned_content = '\n'.join(cleaned_lines)
@@ -212,36 +244,13 @@ class NoiseRobustParser:
         Extract patterns from potentially noisy log data using fuzzy matching.
         Tolerates minor formatting inconsistencies.
         """
-        patterns = {
-            'timestamps': [],
-            'ip_addresses': [],
-            'error_codes': [],
-            'severity_levels': []
+        # One scan of the whole buffer per pattern instead of a Python loop over lines
+        return {
+            'timestamps': self.TIMESTAMP_PATTERN.findall(content),
+            'ip_addresses': self.IP_PATTERN.findall(content),
+            'error_codes': self.ERROR_CODE_PATTERN.findall(content),
+            'severity_levels': self.SEVERITY_PATTERN.findall(content)
         }
-        
-        # Flexible regex patterns that tolerate noise
-        timestamp_pattern = re.compile(r'\d{4}[-/]\d{2}[-/]\d{2}[\sT]\d{2}:\d{2}:\d{2}', re.IGNORECASE)
-        ip_pattern = re.compile(r'\b(?:\d{1,3}\.){3}\d{1,3}\b')
-        error_code_pattern = re.compile(r'\b[A-Z]{2,5}[-_]?\d{3,5}\b')
-        severity_pattern = re.compile(r'\b(FATAL|ERROR|WARN|WARNING|INFO|DEBUG|TRACE)\b', re.IGNORECASE)
-        
-        lines = content.split('\n')
-        for line in lines:
-            if not line.strip():
-                continue
-            
-            # Extract patterns with error tolerance
-            timestamps = timestamp_pattern.findall(line)
-            ips = ip_pattern.findall(line)
-            errors = error_code_pattern.findall(line)
-            severities = severity_pattern.findall(line)
-            
-            patterns['timestamps'].extend(timestamps)
-            patterns['ip_addresses'].extend(ips)
-            patterns['error_codes'].extend(errors)
-            patterns['severity_levels'].extend(severities)
-        
-        return patterns
 
 
 class ContinualLearningEngine:
@@ -251,25 +260,35 @@ class ContinualLearningEngine:
     """
     
     def __init__(self):
-        self.pattern_memory = defaultdict(lambda: {'count': 0, 'anomaly_rate': 0.0, 'last_seen': None})
+        # Pattern memory as parallel arrays indexed by pattern_index[key] rather than a
+        # dict per pattern: compact for the thousands of patterns a busy log produces
+        self.pattern_index = {}
+        self.pattern_counts = array('q')
+        self.pattern_anomaly_rates = array('d')
+        self.pattern_last_seen = array('d')
         self.baseline_stats = {}
+        # Key order shared by every (timestamp, values) snapshot in adaptation_history
+        self.baseline_keys = ()
         self.drift_detector = {
             'window_size': 1000,
             'recent_patterns': deque(maxlen=1000),
             'baseline_established': False
         }
-        self.adaptation_history = []
+        self.adaptation_history = deque(maxlen=100)  # Keep last 100 updates
     
-    def update_baseline(self, stats):
+    def update_baseline(self, stats, now=None):
         """
         Update baseline statistics with new observations.
         Uses exponential moving average for smooth adaptation.
         """
+        if now is None:
+            now = time.time()
         alpha = 0.3  # Smoothing factor for EMA
         
         for key, value in stats.items():
             if key not in self.baseline_stats:
                 self.baseline_stats[key] = value
+                self.baseline_keys += (key,)
             else:
                 # Exponential moving average update
                 self.baseline_stats[key] = (
@@ -278,15 +297,8 @@ class ContinualLearningEngine:
         
         self.drift_detector['baseline_established'] = True
         
-        # Track adaptation
-        self.adaptation_history.append({
-            'timestamp': datetime.now().isoformat(),
-            'baseline_snapshot': self.baseline_stats.copy()
-        })
-        
-        # Keep only recent history (last 100 updates)
-        if len(self.adaptation_history) > 100:
-            self.adaptation_history = self.adaptation_history[-100:]
+        # Track adaptation as a compact snapshot of values in baseline_keys order
+        self.adaptation_history.append((now, tuple(self.baseline_stats.values())))
     
     def detect_distribution_drift(self, current_stats):
         """
@@ -296,49 +308,55 @@ class ContinualLearningEngine:
         if not self.drift_detector['baseline_established']:
             return False, 0.0
         
-        # Calculate drift score using statistical distance
-        drift_score = 0.0
-        count = 0
+        # Calculate drift score using statistical distance (relative difference per stat)
+        baseline_stats = self.baseline_stats
+        relative_diffs = [
+            abs(current_val - baseline_stats[key]) / baseline_stats[key]
+            for key, current_val in current_stats.items()
+            if key != 'total_lines' and baseline_stats.get(key, 0) > 0
+        ]
         
-        for key in current_stats:
-            if key in self.baseline_stats and key != 'total_lines':
-                baseline_val = self.baseline_stats[key]
-                current_val = current_stats[key]
-                
-                if baseline_val > 0:
-                    # Relative difference
-                    relative_diff = abs(current_val - baseline_val) / baseline_val
-                    drift_score += relative_diff
-                    count += 1
-        
-        avg_drift = drift_score / max(count, 1)
+        avg_drift = sum(relative_diffs) / max(len(relative_diffs), 1)
         
         # Drift threshold: 50% average change indicates significant drift
         is_drifting = avg_drift > 0.5
         
         return is_drifting, avg_drift
     
-    def learn_pattern(self, pattern_type, pattern_value, is_anomaly=False):
+    def learn_pattern(self, pattern_type, pattern_value, is_anomaly=False, now=None):
         """
         Learn new patterns in a continual manner without forgetting.
         Updates pattern memory with new observations.
         """
+        self.learn_pattern_bulk(pattern_type, pattern_value, 1, is_anomaly, now)
+    
+    def learn_pattern_bulk(self, pattern_type, pattern_value, occurrences, is_anomaly=False, now=None):
+        """
+        Learn several occurrences of the same pattern in one update.
+        """
+        if now is None:
+            now = time.time()
         key = f"{pattern_type}:{pattern_value}"
-        self.pattern_memory[key]['count'] += 1
-        self.pattern_memory[key]['last_seen'] = datetime.now().isoformat()
+        i = self.pattern_index.get(key)
+        if i is None:
+            i = self.pattern_index[key] = len(self.pattern_counts)
+            self.pattern_counts.append(0)
+            self.pattern_anomaly_rates.append(0.0)
+            self.pattern_last_seen.append(0.0)
+        count = self.pattern_counts[i] + occurrences
+        self.pattern_counts[i] = count
+        self.pattern_last_seen[i] = now
         
         if is_anomaly:
             # Update anomaly rate using incremental average
-            old_rate = self.pattern_memory[key]['anomaly_rate']
-            count = self.pattern_memory[key]['count']
-            self.pattern_memory[key]['anomaly_rate'] = (
-                old_rate * (count - 1) + 1.0
+            self.pattern_anomaly_rates[i] = (
+                self.pattern_anomaly_rates[i] * (count - occurrences) + occurrences
             ) / count
         
         # Add to recent patterns for drift detection
         self.drift_detector['recent_patterns'].append({
             'pattern': key,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now,
             'is_anomaly': is_anomaly
         })
     
@@ -347,12 +365,12 @@ class ContinualLearningEngine:
         Get confidence score for a pattern based on historical observations.
         Higher confidence for frequently seen patterns.
         """
-        key = f"{pattern_type}:{pattern_value}"
-        if key not in self.pattern_memory:
+        i = self.pattern_index.get(f"{pattern_type}:{pattern_value}")
+        if i is None:
             return 0.5  # Neutral confidence for unseen patterns
         
-        count = self.pattern_memory[key]['count']
-        anomaly_rate = self.pattern_memory[key]['anomaly_rate']
+        count = self.pattern_counts[i]
+        anomaly_rate = self.pattern_anomaly_rates[i]
         
         # Confidence based on observation frequency and anomaly history
         frequency_confidence = min(count / 100, 1.0)  # Normalize to [0, 1]
@@ -374,14 +392,59 @@ class AdvancedLogAnalyzer:
         self.parser = NoiseRobustParser()
         self.learner = ContinualLearningEngine()
         self.analysis_count = 0
+        # Reports are generated concurrently; learning state must be updated atomically
+        self.lock = Lock()
+        
+        # Extraction results by content hash: every question of an upload analyzes the
+        # same log, so its reports share one parse (in-flight parses are shared too)
+        self.extract_cache = OrderedDict()
+        self.extract_cache_lock = Lock()
+        self.max_cached_extracts = 4
     
-    def analyze(self, content, feedback=None):
+    def analyze(self, content, feedback=None, content_hash=None):
         """
         Comprehensive analysis with all advanced features.
-        Returns enriched statistics and insights.
+        Returns enriched statistics and insights. With a content_hash, the parsing and
+        extraction of that content are reused; the learning steps still run per call.
         """
-        self.analysis_count += 1
-        
+        # Parsing and extraction touch no shared state, so concurrent calls run them
+        # in parallel and only serialize the learning steps
+        if content_hash is None:
+            extracted = self._extract(content)
+        else:
+            extracted = self._extract_cached(content, content_hash)
+        with self.lock:
+            return self._evaluate(*extracted, feedback)
+    
+    def _extract_cached(self, content, content_hash):
+        """_extract() memoized on content_hash; concurrent callers share a single parse"""
+        with self.extract_cache_lock:
+            pending = self.extract_cache.get(content_hash)
+            is_builder = pending is None
+            if is_builder:
+                pending = Future()
+                self.extract_cache[content_hash] = pending
+                if len(self.extract_cache) > self.max_cached_extracts:
+                    self.extract_cache.popitem(last=False)
+            else:
+                self.extract_cache.move_to_end(content_hash)
+        
+        if not is_builder:
+            return pending.result()
+        
+        try:
+            extracted = self._extract(content)
+        except Exception as e:
+            with self.extract_cache_lock:
+                if self.extract_cache.get(content_hash) is pending:
+                    del self.extract_cache[content_hash]
+            pending.set_exception(e)
+            raise
+        pending.set_result(extracted)
+        return extracted
+    
+    def _extract(self, content):
+        """Parse content and extract its stats, corruption stats and patterns (steps 1-3, lock-free)"""
         # Step 1: Robust parsing to handle noisy/corrupted data
         cleaned_content, corruption_stats = self.parser.parse_robust(content)
         
@@ -389,22 +452,18 @@ class AdvancedLogAnalyzer:
         patterns = self.parser.extract_patterns_robust(cleaned_content)
         
         # Step 3: Calculate basic statistics
-        lines = cleaned_content.split('\n')
-        stats = {
-            'total_lines': len([l for l in lines if l.strip()]),
-            'error_count': len([l for l in lines if 'error' in l.lower()]),
-            'warning_count': len([l for l in lines if 'warning' in l.lower()]),
-            'failed_count': len([l for l in lines if 'failed' in l.lower()]),
-            'timeout_count': len([l for l in lines if 'timeout' in l.lower()]),
-            'ssh_count': len([l for l in lines if 'ssh' in l.lower()]),
-            'auth_count': len([l for l in lines if 'auth' in l.lower()]),
-            'connection_count': len([l for l in lines if 'connection' in l.lower()]),
-            'denied_count': len([l for l in lines if 'denied' in l.lower()]),
-            'accepted_count': len([l for l in lines if 'accepted' in l.lower()]),
-        }
+        stats = LogAnalyzer.count_keywords(cleaned_content)
+        
+        return stats, corruption_stats, patterns
+    
+    def _evaluate(self, stats, corruption_stats, patterns, feedback=None):
+        """Run the adaptive steps 4-9 on extracted data (caller holds the lock)"""
+        self.analysis_count += 1
+        # One timestamp (epoch seconds) for every record made during this analysis
+        now = time.time()
         
         # Step 4: Optimize thresholds adaptively
-        optimized_thresholds = self.optimizer.optimize_thresholds(stats, feedback)
+        optimized_thresholds = self.optimizer.optimize_thresholds(stats, feedback, now)
         
         # Step 5: Get adaptive severity
         severity, confidence = self.optimizer.get_adaptive_severity(stats)
@@ -413,13 +472,17 @@ class AdvancedLogAnalyzer:
         is_drifting, drift_score = self.learner.detect_distribution_drift(stats)
         
         # Step 7: Update continual learning baseline
-        self.learner.update_baseline(stats)
+        self.learner.update_baseline(stats, now)
         
         # Step 8: Learn patterns for continual adaptation
+        unique_error_codes = 0
         for pattern_type, pattern_list in patterns.items():
-            for pattern_value in set(pattern_list):  # Unique patterns only
-                is_anomaly = pattern_type == 'error_codes'  # Simple heuristic
-                self.learner.learn_pattern(pattern_type, pattern_value, is_anomaly)
+            is_anomaly = pattern_type == 'error_codes'  # Simple heuristic
+            pattern_counts = Counter(pattern_list)
+            if is_anomaly:
+                unique_error_codes = len(pattern_counts)
+            for pattern_value, occurrences in pattern_counts.items():
+                self.learner.learn_pattern_bulk(pattern_type, pattern_value, occurrences, is_anomaly, now)
         
         # Step 9: Update optimizer from feedback (continual learning)
         if feedback:
@@ -430,6 +493,7 @@ class AdvancedLogAnalyzer:
             'stats': stats,
             'corruption_stats': corruption_stats,
             'patterns': patterns,
+            'unique_error_codes': unique_error_codes,
             'severity': severity,
             'confidence': confidence,
             'optimized_thresholds': optimized_thresholds,
@@ -440,12 +504,12 @@ class AdvancedLogAnalyzer:
             'learning_metadata': {
                 'analysis_count': self.analysis_count,
                 'baseline_established': self.learner.drift_detector['baseline_established'],
-                'pattern_memory_size': len(self.learner.pattern_memory),
+                'pattern_memory_size': len(self.learner.pattern_index),
                 'threshold_adjustments': len(self.optimizer.threshold_history)
             }
         }
     
     @staticmethod
     def get_file_hash(content):
-        """Generate hash of file content"""
-        return hashlib.md5(content.encode()).hexdigest()
+        """Generate hash of file content (str or raw bytes)"""
+        return LogAnalyzer.get_file_hash(content)
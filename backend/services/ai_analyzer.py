@@ -3,14 +3,19 @@ AI-Powered Log Analyzer using NVIDIA AI Models
 Uses nv-embedqa-e5-v5 for embeddings, Llama 3.1 for reasoning, and FAISS for retrieval
 """
 import os
-import hashlib
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import BoundedSemaphore, Lock
 from typing import List, Dict, Tuple, Optional, Any
 import numpy as np
+from .analyzer import LogAnalyzer
 
 try:
     from langchain_nvidia_ai_endpoints import NVIDIAEmbeddings, ChatNVIDIA
     from langchain.text_splitter import RecursiveCharacterTextSplitter
     from langchain_community.vectorstores import FAISS
+    from langchain_community.docstore.in_memory import InMemoryDocstore
+    import faiss
     from langchain.schema import Document
     NVIDIA_AVAILABLE = True
 except ImportError:
@@ -61,60 +66,267 @@ class AILogAnalyzer:
         self.vector_store = None
         self.log_chunks = []
         self.embedding_time = 0  # Track embedding time
+        
+        # Query embeddings of the analysis questions; the questions are fixed, so each
+        # one only needs a single round-trip to the embedding endpoint per process
+        self.question_embeddings = {}
+        
+        # FAISS indexes by content hash: every question of a request (and any repeat
+        # upload) searches the same log, so it is chunked and embedded only once.
+        # Each index holds its vectors and chunk text (~4 KB per chunk), so the cache
+        # is bounded by total chunks as well as by entries
+        self.index_cache = OrderedDict()
+        self.index_cache_lock = Lock()
+        self.index_chunk_counts = {}
+        self.cached_index_chunks = 0
+        self.max_cached_indexes = 4
+        self.max_cached_index_chunks = 20000
+        
+        # LLM answers by (content hash, question, top_k): the same question about the
+        # same log retrieves the same evidence, so the answer is reused
+        self.analysis_cache = OrderedDict()
+        self.analysis_cache_lock = Lock()
+        self.max_cached_analyses = 256
+        
+        # Chunk embeddings by chunk hash, stored as float32 (what FAISS indexes anyway);
+        # appended or re-uploaded logs only send their new chunks to the embedding endpoint
+        self.chunk_embeddings = OrderedDict()
+        self.chunk_embeddings_lock = Lock()
+        self.max_cached_chunk_embeddings = 10000
+        
+        # New chunks are embedded in batches sent concurrently: the time goes to remote
+        # inference round-trips, not local CPU, so threads overlap them well
+        self.embedding_batch_size = 64
+        self.embedding_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='embed')
+        
+        # Every request to the NVIDIA endpoints (each embedding batch, query embedding and
+        # LLM call) takes a slot, keeping this worker within the endpoints' rate limits
+        self.remote_call_slots = BoundedSemaphore(5)
+        
+        # Logs with at least this many chunks get an FP16 HNSW graph index (approximate,
+        # logarithmic search) instead of FAISS's default exhaustive flat L2 index
+        self.hnsw_min_chunks = 2000
     
-    def process_log_file(self, log_content: str) -> Tuple[Dict, Any]:
+    def process_log_file(self, log_content: str, content_hash: Optional[str] = None,
+                         stats: Optional[Dict] = None) -> Tuple[Dict, Any]:
         """
         Process log file: chunk, embed, and index with FAISS
         
+        With a content_hash the index is cached, and callers asking for the same
+        content (including concurrent ones) share a single build. Callers that
+        already counted the log's keywords pass them as stats to skip a recount.
+        
         Returns:
-            - statistics dictionary (includes embedding_time_ms)
+            - statistics dictionary (includes embedding_time_ms, 0 when cached, and the
+              FAISS index class as index_type when anything was indexed)
             - FAISS vector store for retrieval
         """
+        if content_hash is None:
+            return self._build_index(log_content, stats)
+        
+        with self.index_cache_lock:
+            pending = self.index_cache.get(content_hash)
+            is_builder = pending is None
+            if is_builder:
+                pending = Future()
+                self.index_cache[content_hash] = pending
+                self._evict_indexes()
+            else:
+                self.index_cache.move_to_end(content_hash)
+        
+        if not is_builder:
+            stats, vector_store = pending.result()
+            return {**stats, 'embedding_time_ms': 0}, vector_store
+        
+        try:
+            result = self._build_index(log_content, stats)
+        except Exception as e:
+            with self.index_cache_lock:
+                if self.index_cache.get(content_hash) is pending:
+                    del self.index_cache[content_hash]
+            pending.set_exception(e)
+            raise
+        vector_store = result[1]
+        with self.index_cache_lock:
+            chunk_count = vector_store.index.ntotal if vector_store is not None else 0
+            if chunk_count > self.max_cached_index_chunks:
+                # Too big to cache at all; callers already waiting still share this build
+                if self.index_cache.get(content_hash) is pending:
+                    del self.index_cache[content_hash]
+            elif self.index_cache.get(content_hash) is pending:
+                self.index_chunk_counts[content_hash] = chunk_count
+                self.cached_index_chunks += chunk_count
+                self._evict_indexes()
+        pending.set_result(result)
+        return result
+    
+    def _evict_indexes(self):
+        """Drop the least recently used indexes over the entry or chunk budget (caller holds the lock)"""
+        while len(self.index_cache) > self.max_cached_indexes:
+            content_hash, _ = self.index_cache.popitem(last=False)
+            self.cached_index_chunks -= self.index_chunk_counts.pop(content_hash, 0)
+        # Only built indexes count towards the chunk budget; builds in progress stay
+        for content_hash in list(self.index_cache):
+            if self.cached_index_chunks <= self.max_cached_index_chunks:
+                break
+            if content_hash in self.index_chunk_counts:
+                del self.index_cache[content_hash]
+                self.cached_index_chunks -= self.index_chunk_counts.pop(content_hash)
+    
+    def _build_index(self, log_content: str, stats: Optional[Dict] = None) -> Tuple[Dict, Any]:
+        """Chunk, embed, and index log content with FAISS"""
         import time
         
-        # Extract basic statistics first (fallback for compatibility)
-        stats = self._extract_basic_stats(log_content)
+        # Extract basic statistics first (fallback for compatibility); copied when given
+        # since the embedding time is added to them
+        stats = dict(stats) if stats is not None else self._extract_basic_stats(log_content)
         
         # Split log content into chunks using RecursiveCharacterTextSplitter
+        # (kept local so concurrent requests never see each other's index)
         documents = [Document(page_content=log_content, metadata={"source": "log_file"})]
-        self.log_chunks = self.text_splitter.split_documents(documents)
+        log_chunks = self.text_splitter.split_documents(documents)
+        vector_store = None
         
-        print(f"📝 Split log into {len(self.log_chunks)} chunks")
+        print(f"📝 Split log into {len(log_chunks)} chunks")
         
         # 3. Vector Retrieval Model: FAISS
         # Create FAISS index from embeddings for O(1) similarity search
-        if self.log_chunks:
-            embedding_start = time.time()
-            self.vector_store = FAISS.from_documents(
-                self.log_chunks,
-                self.embeddings
-            )
-            self.embedding_time = (time.time() - embedding_start) * 1000
-            stats['embedding_time_ms'] = self.embedding_time
-            print(f"✅ Indexed {len(self.log_chunks)} chunks in FAISS vector store ({self.embedding_time:.2f}ms)")
-        
-        return stats, self.vector_store
+        if log_chunks:
+            embedding_start = time.perf_counter_ns()
+            texts = [chunk.page_content for chunk in log_chunks]
+            vectors = self._embed_chunks(texts)
+            if len(log_chunks) >= self.hnsw_min_chunks:
+                vector_store = self._build_hnsw_store(log_chunks, vectors)
+            else:
+                vector_store = FAISS.from_embeddings(
+                    list(zip(texts, vectors)),
+                    self.embeddings,
+                    metadatas=[chunk.metadata for chunk in log_chunks]
+                )
+            embedding_time = (time.perf_counter_ns() - embedding_start) / 1e6
+            stats['embedding_time_ms'] = embedding_time
+            stats['index_type'] = type(vector_store.index).__name__
+            self.embedding_time = embedding_time
+            print(f"✅ Indexed {len(log_chunks)} chunks in FAISS vector store ({embedding_time:.2f}ms)")
+        
+        self.log_chunks = log_chunks
+        self.vector_store = vector_store
+        return stats, vector_store
     
-    def analyze_with_llm(self, question: str, top_k: int = 4) -> Dict:
+    def _embed_chunks(self, texts: List[str]) -> List[np.ndarray]:
+        """Embed chunk texts, sending only chunks not seen before"""
+        hashes = [LogAnalyzer.get_file_hash(text) for text in texts]
+        
+        vectors = {}
+        with self.chunk_embeddings_lock:
+            for h in hashes:
+                vectors[h] = self.chunk_embeddings.get(h)
+                if vectors[h] is not None:
+                    self.chunk_embeddings.move_to_end(h)
+        missing = {h: text for h, text in zip(hashes, texts) if vectors[h] is None}
+        
+        if missing:
+            texts_to_embed = list(missing.values())
+            batches = [
+                texts_to_embed[i:i + self.embedding_batch_size]
+                for i in range(0, len(texts_to_embed), self.embedding_batch_size)
+            ]
+            new_vectors = [
+                vector
+                for batch in self.embedding_executor.map(self._embed_batch, batches)
+                for vector in batch
+            ]
+            with self.chunk_embeddings_lock:
+                for h, vector in zip(missing, new_vectors):
+                    vectors[h] = np.asarray(vector, dtype=np.float32)
+                    self.chunk_embeddings[h] = vectors[h]
+                    if len(self.chunk_embeddings) > self.max_cached_chunk_embeddings:
+                        self.chunk_embeddings.popitem(last=False)
+        
+        return [vectors[h] for h in hashes]
+    
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed one batch of chunk texts, holding a remote call slot"""
+        with self.remote_call_slots:
+            return self.embeddings.embed_documents(texts)
+    
+    def _build_hnsw_store(self, log_chunks: List[Any], vectors: List[np.ndarray]) -> Any:
+        """Index chunk vectors in an HNSW graph wrapped as a LangChain FAISS store"""
+        matrix = np.vstack(vectors).astype(np.float32, copy=False)
+        # Vectors are stored as FP16: half the memory streamed per search, negligible recall loss
+        index = faiss.IndexHNSWSQ(matrix.shape[1], faiss.ScalarQuantizer.QT_fp16, 32)
+        index.hnsw.efConstruction = 80
+        index.hnsw.efSearch = 64  # Search breadth: recall close to exhaustive search
+        index.train(matrix)
+        index.add(matrix)
+        
+        ids = [str(i) for i in range(len(log_chunks))]
+        return FAISS(
+            embedding_function=self.embeddings,
+            index=index,
+            docstore=InMemoryDocstore(dict(zip(ids, log_chunks))),
+            index_to_docstore_id=dict(enumerate(ids))
+        )
+    
+    def get_question_embedding(self, question: str) -> List[float]:
+        """Get the query embedding for a question, embedding it on first use"""
+        embedding = self.question_embeddings.get(question)
+        if embedding is None:
+            # Concurrent first uses may both embed; the results are identical
+            with self.remote_call_slots:
+                embedding = self.embeddings.embed_query(question)
+            self.question_embeddings[question] = embedding
+        return embedding
+    
+    def analyze_with_llm(self, question: str, top_k: int = 4, vector_store: Any = None,
+                         content_hash: Optional[str] = None) -> Dict:
         """
         Analyze logs using semantic retrieval + LLM reasoning
         
         Args:
             question: User's analysis question
             top_k: Number of relevant chunks to retrieve (default: 4)
+            vector_store: Store returned by process_log_file(); defaults to the last
+                processed one, which is not safe when requests run concurrently
+            content_hash: Hash of the indexed log; when given, answers are cached
         
         Returns:
             Analysis results with root cause, evidence, recommendations, and timing metadata
+            (all timings 0 when the answer came from the cache)
         """
+        if content_hash is None:
+            return self._analyze_with_llm(question, top_k, vector_store)
+        
+        cache_key = (content_hash, question, top_k)
+        with self.analysis_cache_lock:
+            analysis = self.analysis_cache.get(cache_key)
+            if analysis is not None:
+                self.analysis_cache.move_to_end(cache_key)
+        if analysis is not None:
+            return {
+                **analysis,
+                'timing_metadata': {'retrieval_time_ms': 0, 'llm_time_ms': 0, 'total_time_ms': 0}
+            }
+        
+        analysis = self._analyze_with_llm(question, top_k, vector_store)
+        with self.analysis_cache_lock:
+            self.analysis_cache[cache_key] = analysis
+            if len(self.analysis_cache) > self.max_cached_analyses:
+                self.analysis_cache.popitem(last=False)
+        return analysis
+    
+    def _analyze_with_llm(self, question: str, top_k: int, vector_store: Any) -> Dict:
+        """Retrieve evidence for a question and ask the LLM about it"""
         import time
         
-        if not self.vector_store:
+        vector_store = vector_store or self.vector_store
+        if not vector_store:
             raise ValueError("No vector store available. Call process_log_file() first.")
         
         # Track retrieval time
-        retrieval_start = time.time()
-        relevant_docs = self.vector_store.similarity_search(question, k=top_k)
-        retrieval_time = (time.time() - retrieval_start) * 1000
+        retrieval_start = time.perf_counter_ns()
+        relevant_docs = vector_store.similarity_search_by_vector(self.get_question_embedding(question), k=top_k)
+        retrieval_time = (time.perf_counter_ns() - retrieval_start) / 1e6
         
         # Combine relevant chunks into context
         context = "\n\n".join([doc.page_content for doc in relevant_docs])
@@ -138,9 +350,10 @@ Provide a structured analysis with:
 Be factual and evidence-based. Do not hallucinate information not present in the logs."""
 
         # Track LLM generation time
-        llm_start = time.time()
-        response = self.llm.invoke(prompt)
-        llm_time = (time.time() - llm_start) * 1000
+        with self.remote_call_slots:
+            llm_start = time.perf_counter_ns()
+            response = self.llm.invoke(prompt)
+            llm_time = (time.perf_counter_ns() - llm_start) / 1e6
         
         # Parse LLM response
         analysis = self._parse_llm_response(response.content, relevant_docs)
@@ -156,20 +369,7 @@ Be factual and evidence-based. Do not hallucinate information not present in the
     
     def _extract_basic_stats(self, content: str) -> Dict:
         """Extract basic statistics from log content (for compatibility)"""
-        lines = content.split('\n')
-        
-        return {
-            'total_lines': len([l for l in lines if l.strip()]),
-            'error_count': len([l for l in lines if 'error' in l.lower()]),
-            'warning_count': len([l for l in lines if 'warning' in l.lower()]),
-            'failed_count': len([l for l in lines if 'failed' in l.lower()]),
-            'timeout_count': len([l for l in lines if 'timeout' in l.lower()]),
-            'ssh_count': len([l for l in lines if 'ssh' in l.lower()]),
-            'auth_count': len([l for l in lines if 'auth' in l.lower()]),
-            'connection_count': len([l for l in lines if 'connection' in l.lower()]),
-            'denied_count': len([l for l in lines if 'denied' in l.lower()]),
-            'accepted_count': len([l for l in lines if 'accepted' in l.lower()]),
-        }
+        return LogAnalyzer.count_keywords(content)
     
     def _parse_llm_response(self, response_text: str, evidence_docs: List[Any]) -> Dict:
         """Parse LLM response into structured format"""
@@ -190,7 +390,8 @@ Be factual and evidence-based. Do not hallucinate information not present in the
         # Parse response sections
         current_section = None
         for line in lines:
-            line_lower = line.lower().strip()
+            stripped = line.strip()
+            line_lower = stripped.lower()
             
             if 'root cause' in line_lower:
                 current_section = 'root_cause'
@@ -214,14 +415,14 @@ Be factual and evidence-based. Do not hallucinate information not present in the
                 current_section = 'actions'
             elif 'recommendation' in line_lower:
                 current_section = 'recommendations'
-            elif line.strip() and current_section:
+            elif stripped and current_section:
                 # Add content to current section
                 if current_section == 'root_cause' and not line.startswith('**'):
                     result['root_cause_explanation'] += line + ' '
-                elif current_section == 'actions' and (line.strip().startswith('-') or line.strip().startswith('•') or line.strip()[0].isdigit()):
-                    result['immediate_actions'].append(line.strip().lstrip('-•0123456789. '))
-                elif current_section == 'recommendations' and (line.strip().startswith('-') or line.strip().startswith('•')):
-                    result['recommendations'].append(line.strip().lstrip('-• '))
+                elif current_section == 'actions' and (stripped.startswith(('-', '•')) or stripped[0].isdigit()):
+                    result['immediate_actions'].append(stripped.lstrip('-•0123456789. '))
+                elif current_section == 'recommendations' and stripped.startswith(('-', '•')):
+                    result['recommendations'].append(stripped.lstrip('-• '))
         
         # Clean up root cause
         result['root_cause_explanation'] = result['root_cause_explanation'].strip()
@@ -231,24 +432,29 @@ Be factual and evidence-based. Do not hallucinate information not present in the
         return result
     
     @staticmethod
-    def get_file_hash(content: str) -> str:
-        """Generate hash of file content"""
-        return hashlib.md5(content.encode()).hexdigest()
+    def get_file_hash(content) -> str:
+        """Generate hash of file content (str or raw bytes)"""
+        return LogAnalyzer.get_file_hash(content)
 
 
 # Singleton instance for reuse
 _ai_analyzer_instance = None
+_ai_analyzer_failed = False
+_ai_analyzer_lock = Lock()
 
 def get_ai_analyzer() -> AILogAnalyzer:
-    """Get or create AI analyzer instance"""
-    global _ai_analyzer_instance
+    """Get or create AI analyzer instance (None if it cannot be initialized)"""
+    global _ai_analyzer_instance, _ai_analyzer_failed
     
-    if _ai_analyzer_instance is None:
-        try:
-            _ai_analyzer_instance = AILogAnalyzer()
-        except Exception as e:
-            print(f"⚠️  Could not initialize AI analyzer: {e}")
-            print("Falling back to basic analyzer")
-            return None
+    # A failed initialization is remembered so every report does not retry it
+    if _ai_analyzer_instance is None and not _ai_analyzer_failed:
+        with _ai_analyzer_lock:
+            if _ai_analyzer_instance is None and not _ai_analyzer_failed:
+                try:
+                    _ai_analyzer_instance = AILogAnalyzer()
+                except Exception as e:
+                    _ai_analyzer_failed = True
+                    print(f"⚠️  Could not initialize AI analyzer: {e}")
+                    print("Falling back to basic analyzer")
     
     return _ai_analyzer_instance
@@ -2,34 +2,63 @@
 Log Analyzer Service - Processes log content
 """
 import hashlib
+from collections import Counter
+
+# Keyword each count looks for (case-insensitive), in stats key order
+KEYWORD_COUNTS = (
+    ('error', 'error_count'),
+    ('warning', 'warning_count'),
+    ('failed', 'failed_count'),
+    ('timeout', 'timeout_count'),
+    ('ssh', 'ssh_count'),
+    ('auth', 'auth_count'),
+    ('connection', 'connection_count'),
+    ('denied', 'denied_count'),
+    ('accepted', 'accepted_count'),
+)
+
+# Leading lines inspected to decide whether a log is repetitive enough to deduplicate
+DEDUP_SAMPLE_LINES = 1000
 
 class LogAnalyzer:
     """Analyzes log file content and generates statistics"""
     
     @staticmethod
-    def extract_log_stats(content):
-        """Extract statistics from log content"""
-        lines = content.split('\n')
+    def count_keywords(content):
+        """Count non-empty lines and lines containing each keyword"""
+        # Lowercase once for the whole content and drop blank lines once; isspace()
+        # does that without allocating a stripped copy of every line
+        lowered = content.lower()
+        lines = [line for line in lowered.split('\n') if line and not line.isspace()]
+        
+        stats = {'total_lines': len(lines)}
         
-        stats = {
-            'total_lines': len([l for l in lines if l.strip()]),
-            'error_count': len([l for l in lines if 'error' in l.lower()]),
-            'warning_count': len([l for l in lines if 'warning' in l.lower()]),
-            'failed_count': len([l for l in lines if 'failed' in l.lower()]),
-            'timeout_count': len([l for l in lines if 'timeout' in l.lower()]),
-            'ssh_count': len([l for l in lines if 'ssh' in l.lower()]),
-            'auth_count': len([l for l in lines if 'auth' in l.lower()]),
-            'connection_count': len([l for l in lines if 'connection' in l.lower()]),
-            'denied_count': len([l for l in lines if 'denied' in l.lower()]),
-            'accepted_count': len([l for l in lines if 'accepted' in l.lower()]),
-        }
+        # Spammy logs repeat the same lines over and over: when a sample of the lines is
+        # mostly duplicates, test each distinct line once and weight it by how often it occurs
+        sample = lines[:DEDUP_SAMPLE_LINES]
+        if len(set(sample)) * 2 < len(sample):
+            line_counts = Counter(lines).items()
+            for keyword, key in KEYWORD_COUNTS:
+                stats[key] = sum([n for line, n in line_counts if keyword in line]) if keyword in lowered else 0
+            return stats
         
-        error_lines = [l.strip()[:100] for l in lines if 'error' in l.lower()][:3]
-        warning_lines = [l.strip()[:100] for l in lines if 'warning' in l.lower()][:3]
+        for keyword, key in KEYWORD_COUNTS:
+            # Counts are of lines, not occurrences, so a whole-buffer scan can only rule
+            # a keyword out, which skips its per-line pass
+            stats[key] = len([line for line in lines if keyword in line]) if keyword in lowered else 0
         
-        return stats, error_lines, warning_lines
+        return stats
     
     @staticmethod
     def get_file_hash(content):
-        """Generate hash of file content"""
-        return hashlib.md5(content.encode()).hexdigest()
+        """Generate hash of file content (str, or any bytes-like object to skip re-encoding)"""
+        if isinstance(content, str):
+            # surrogatepass: pasted text can carry lone surrogates that strict UTF-8 rejects
+            content = content.encode('utf-8', 'surrogatepass')
+        return _content_digest(content).hexdigest()
+
+
+def _content_digest(data):
+    """New content-fingerprint hash object fed with data"""
+    # SHA-256 fingerprint, not a security control (so FIPS-restricted builds allow it)
+    return hashlib.sha256(data, usedforsecurity=False)
@@ -1,4 +1,5 @@
 """Utils package"""
 from .file_utils import allowed_file, ensure_upload_folder
+from .json_provider import FastJSONProvider
 
-__all__ = ['allowed_file', 'ensure_upload_folder']
+__all__ = ['allowed_file', 'ensure_upload_folder', 'FastJSONProvider']
@@ -3,13 +3,13 @@ File utilities
 """
 import os
 
-ALLOWED_EXTENSIONS = {'log', 'txt'}
+ALLOWED_EXTENSIONS = frozenset({'log', 'txt'})
+ALLOWED_SUFFIXES = tuple('.' + ext for ext in ALLOWED_EXTENSIONS)
 
 def allowed_file(filename):
     """Check if file is allowed"""
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return bool(filename) and filename.lower().endswith(ALLOWED_SUFFIXES)
 
 def ensure_upload_folder(folder):
     """Ensure upload folder exists"""
-    if not os.path.exists(folder):
-        os.makedirs(folder)
+    os.makedirs(folder, exist_ok=True)
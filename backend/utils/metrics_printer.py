@@ -1,164 +1,283 @@
 """
 Performance Metrics Printer - Displays real-time analysis metrics
 """
+import json
+import os
+import sys
 import time
+from dataclasses import asdict
 from datetime import datetime
-from typing import Dict, List, Any
+from queue import Full, Queue
+from threading import Lock, Thread
+from typing import Any
+
+from backend.models import AnalysisMetrics
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _or_na(value):
+    """Show missing text as N/A"""
+    return value or 'N/A'
+
+def _round1(value):
+    """Round to one decimal"""
+    return round(value, 1)
+
+def _round2(value):
+    """Round to two decimals"""
+    return round(value, 2)
+
+def _percent(value):
+    """Show a fraction as a percentage"""
+    return f"{round(value * 100, 1)}%"
 
 
 class MetricsPrinter:
     """Prints comprehensive performance metrics to console"""
     
+    # Metrics dumps are written by a background thread so requests never wait on the
+    # console; METRICS_ASYNC_LOG=0 writes them on the calling thread instead. At most
+    # MAX_PENDING_OUTPUT dumps queue up for the writer: once it falls that far behind
+    # (a slow stdout), further dumps are written on the calling thread
+    ASYNC_OUTPUT = os.getenv("METRICS_ASYNC_LOG", "1") != "0"
+    MAX_PENDING_OUTPUT = 64
+    _pending_output = Queue(maxsize=MAX_PENDING_OUTPUT)
+    _writer = None
+    _writer_lock = Lock()
+    
+    # METRICS_MODE: "pretty" (the formatted dump), "json" (one JSON line per analysis,
+    # for log shippers) or "off"
+    OUTPUT_MODE = os.getenv("METRICS_MODE", "pretty")
+    
+    # Header timestamp of the last second one was formatted for: (epoch second, text),
+    # replaced as a whole so concurrent renders never pair a second with another's text
+    _timestamp = (0, "")
+    
+    # Separator lines, built once
+    SEPARATOR = "=" * 80
+    SECTION_SEPARATOR = "─" * 80
+    
+    # Sections with a fixed layout: AnalysisMetrics attribute -> (title, ((label, field, unit, formatter), ...))
+    TABLE_SECTIONS = {
+        'file_info': ("📄 File Information", (
+            ("Filename", 'filename', "", _or_na),
+            ("File Size", 'size', "bytes", None),
+            ("Log Lines", 'lines', "", None),
+            ("File Hash", 'hash', "", _or_na)
+        )),
+        'embedding': ("🔢 Embedding Model Metrics (nv-embedqa-e5-v5)", (
+            ("Embedding Dimension", 'dimension', "", None),
+            ("Mean Embedding Latency", 'latency_ms', "ms", _round2),
+            ("Total Chunks Embedded", 'chunks_embedded', "", None),
+            ("Throughput", 'throughput', "chunks/sec", _round2),
+            ("Total Embedding Time", 'total_time_ms', "ms", _round2)
+        )),
+        'retrieval': ("🔎 Retrieval System Metrics (FAISS)", (
+            ("Index Type", 'index_type', "", None),
+            ("Query Latency (avg)", 'avg_query_latency_ms', "ms", _round2),
+            ("Total Queries", 'total_queries', "", None),
+            ("Top-k Retrieved", 'top_k', "", None),
+            ("Index Build Time", 'index_build_time_ms', "ms", _round2),
+            ("Total Retrieval Time", 'total_retrieval_time_ms', "ms", _round2)
+        )),
+        'llm': ("🤖 LLM Reasoning Metrics (Llama 3.1-70B-Instruct)", (
+            ("Model", 'model', "", None),
+            ("Temperature", 'temperature', "", None),
+            ("Max Tokens", 'max_tokens', "", None),
+            ("Avg Generation Latency", 'avg_latency_ms', "ms", _round2),
+            ("Total Responses Generated", 'total_responses', "", None),
+            ("Total LLM Time", 'total_time_ms', "ms", _round2),
+            ("Avg Tokens per Response", 'avg_tokens', "", _round1)
+        )),
+        'detection': ("🎯 Anomaly Detection Performance", (
+            ("Total Anomalies Detected", 'total_anomalies', "", None),
+            ("Authentication Failures", 'auth_failures', "", None),
+            ("Brute Force Attacks", 'brute_force', "", None),
+            ("Suspicious Sessions", 'suspicious_sessions', "", None),
+            ("Resource Misconfigurations", 'misconfigurations', "", None),
+            ("Security Anomalies", 'security_anomalies', "", None)
+        )),
+        'system': ("⚡ End-to-End System Metrics", (
+            ("Total Analysis Time", 'total_time_ms', "ms", _round2),
+            ("File Processing Latency", 'file_processing_ms', "ms", _round2),
+            ("API Response Time", 'response_time_ms', "ms", _round2),
+            ("Memory Usage (estimated)", 'memory_mb', "MB", _round1)
+        )),
+        'quality': ("✨ Quality Metrics", (
+            ("Evidence-Grounding Rate", 'evidence_grounding', "", _percent),
+            ("Explanation Faithfulness", 'faithfulness', "", _percent),
+            ("Retrieval Accuracy", 'retrieval_accuracy', "", _percent),
+            ("Reasoning Accuracy", 'reasoning_accuracy', "", _percent)
+        ))
+    }
+    # Table sections printed before the RCA section, in order
+    LEADING_SECTIONS = ('file_info', 'embedding', 'retrieval', 'llm', 'detection')
+    
+    # Section headers never change, so they are rendered once here
+    SECTION_HEADERS = {'rca': f"\n{SECTION_SEPARATOR}\n  🔍 Root Cause Analysis (RCA) Metrics\n{SECTION_SEPARATOR}"}
+    for _name, (_title, _) in TABLE_SECTIONS.items():
+        SECTION_HEADERS[_name] = f"\n{SECTION_SEPARATOR}\n  {_title}\n{SECTION_SEPARATOR}"
+    del _name, _title, _
+    
     @staticmethod
-    def print_separator(char="=", length=80):
-        """Print a separator line"""
-        print(char * length)
+    def format_header(title: str):
+        """Format a header block"""
+        separator = MetricsPrinter.SEPARATOR
+        return f"{separator}\n  {title}\n  Timestamp: {MetricsPrinter.format_timestamp()}\n{separator}"
     
     @staticmethod
-    def print_header(title: str):
-        """Print a formatted header"""
-        MetricsPrinter.print_separator()
-        print(f"  {title}")
-        print(f"  Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        MetricsPrinter.print_separator()
+    def format_timestamp():
+        """Format the current time for the header, at most once per second"""
+        now = int(time.time())
+        second, text = MetricsPrinter._timestamp
+        if second != now:
+            text = datetime.fromtimestamp(now).strftime('%Y-%m-%d %H:%M:%S')
+            MetricsPrinter._timestamp = (now, text)
+        return text
     
     @staticmethod
-    def print_section(title: str):
-        """Print a section title"""
-        print(f"\n{'─' * 80}")
-        print(f"  {title}")
-        print(f"{'─' * 80}")
+    def format_metric(name: str, value: Any, unit: str = ""):
+        """Format a single metric line"""
+        if unit:
+            return f"  • {name:<40} : {value} {unit}"
+        return f"  • {name:<40} : {value}"
     
     @staticmethod
-    def print_metric(name: str, value: Any, unit: str = ""):
-        """Print a single metric"""
-        value_str = f"{value} {unit}".strip() if unit else str(value)
-        print(f"  • {name:<40} : {value_str}")
+    def format_table_section(section_name: str, section: Any):
+        """Format the title and metric lines of one of TABLE_SECTIONS"""
+        lines = [MetricsPrinter.SECTION_HEADERS[section_name]]
+        _, fields = MetricsPrinter.TABLE_SECTIONS[section_name]
+        for label, field, unit, formatter in fields:
+            value = getattr(section, field)
+            lines.append(MetricsPrinter.format_metric(label, formatter(value) if formatter else value, unit))
+        return lines
     
     @staticmethod
-    def print_analysis_metrics(metrics_data: Dict[str, Any]):
-        """Print comprehensive analysis metrics"""
+    def print_analysis_metrics(metrics: AnalysisMetrics):
+        """
+        Print comprehensive analysis metrics. The whole dump is rendered first and
+        written at once, so it takes the stdout lock once instead of once per line.
+        """
+        if MetricsPrinter.OUTPUT_MODE == "off":
+            return
+        if MetricsPrinter.OUTPUT_MODE == "json":
+            text = MetricsPrinter.render_analysis_metrics_json(metrics)
+        else:
+            text = MetricsPrinter.render_analysis_metrics(metrics)
+        if MetricsPrinter.ASYNC_OUTPUT:
+            if MetricsPrinter._writer is None:
+                MetricsPrinter._start_writer()
+            try:
+                MetricsPrinter._pending_output.put_nowait(text)
+                return
+            except Full:
+                pass
+        MetricsPrinter.write_output(text)
+    
+    @staticmethod
+    def _start_writer():
+        """Start the daemon thread that writes queued dumps (first async dump only)"""
+        with MetricsPrinter._writer_lock:
+            if MetricsPrinter._writer is None:
+                writer = Thread(target=MetricsPrinter._drain_output, name='metrics-printer', daemon=True)
+                writer.start()
+                MetricsPrinter._writer = writer
+    
+    @staticmethod
+    def _drain_output():
+        """Write queued dumps as they arrive (runs on the writer thread)"""
+        while True:
+            MetricsPrinter.write_output(MetricsPrinter._pending_output.get())
+    
+    @staticmethod
+    def write_output(text: str):
+        """Write rendered text to stdout and flush it"""
+        sys.stdout.write(text)
+        sys.stdout.flush()
+    
+    @staticmethod
+    def render_analysis_metrics_json(metrics: AnalysisMetrics) -> str:
+        """Render analysis metrics as a single JSON line"""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(metrics, option=orjson.OPT_APPEND_NEWLINE).decode()
+        return json.dumps(asdict(metrics)) + "\n"
+    
+    @staticmethod
+    def render_analysis_metrics(metrics: AnalysisMetrics) -> str:
+        """Render comprehensive analysis metrics as console text"""
+        lines = []
+        add = lines.append
+        extend = lines.extend
         
-        MetricsPrinter.print_header("🔍 REAL-TIME PERFORMANCE METRICS")
+        add(MetricsPrinter.format_header("🔍 REAL-TIME PERFORMANCE METRICS"))
         
         # Check if AI features are available
-        has_ai_metrics = (metrics_data.get('embedding_metrics') or 
-                         metrics_data.get('retrieval_metrics') or 
-                         metrics_data.get('llm_metrics'))
+        has_ai_metrics = (metrics.embedding is not None or 
+                         metrics.retrieval is not None or 
+                         metrics.llm is not None)
         
         if not has_ai_metrics:
-            print("\n⚠️  Note: AI features not available - using standard analysis")
-            print("   To enable AI metrics, install: pip install langchain-nvidia-ai-endpoints langchain-community faiss-cpu")
-            print("   And set NVIDIA_API_KEY in your .env file\n")
-        
-        # File Information
-        if 'file_info' in metrics_data:
-            MetricsPrinter.print_section("📄 File Information")
-            file_info = metrics_data['file_info']
-            MetricsPrinter.print_metric("Filename", file_info.get('filename', 'N/A'))
-            MetricsPrinter.print_metric("File Size", file_info.get('size', 0), "bytes")
-            MetricsPrinter.print_metric("Log Lines", file_info.get('lines', 0))
-            MetricsPrinter.print_metric("File Hash", file_info.get('hash', 'N/A'))
-        
-        # 1. Embedding Model Metrics
-        if 'embedding_metrics' in metrics_data and metrics_data['embedding_metrics']:
-            MetricsPrinter.print_section("🔢 Embedding Model Metrics (nv-embedqa-e5-v5)")
-            emb = metrics_data['embedding_metrics']
-            MetricsPrinter.print_metric("Embedding Dimension", emb.get('dimension', 1024))
-            MetricsPrinter.print_metric("Mean Embedding Latency", round(emb.get('latency_ms', 0), 2), "ms")
-            MetricsPrinter.print_metric("Total Chunks Embedded", emb.get('chunks_embedded', 0))
-            MetricsPrinter.print_metric("Throughput", round(emb.get('throughput', 0), 2), "chunks/sec")
-            MetricsPrinter.print_metric("Total Embedding Time", round(emb.get('total_time_ms', 0), 2), "ms")
-        
-        # 2. Retrieval System Metrics
-        if 'retrieval_metrics' in metrics_data and metrics_data['retrieval_metrics']:
-            MetricsPrinter.print_section("🔎 Retrieval System Metrics (FAISS)")
-            ret = metrics_data['retrieval_metrics']
-            MetricsPrinter.print_metric("Index Type", ret.get('index_type', 'IndexFlatIP'))
-            MetricsPrinter.print_metric("Query Latency (avg)", round(ret.get('avg_query_latency_ms', 0), 2), "ms")
-            MetricsPrinter.print_metric("Total Queries", ret.get('total_queries', 0))
-            MetricsPrinter.print_metric("Top-k Retrieved", ret.get('top_k', 4))
-            MetricsPrinter.print_metric("Index Build Time", round(ret.get('index_build_time_ms', 0), 2), "ms")
-            MetricsPrinter.print_metric("Total Retrieval Time", round(ret.get('total_retrieval_time_ms', 0), 2), "ms")
-        
-        # 3. LLM Reasoning Metrics
-        if 'llm_metrics' in metrics_data and metrics_data['llm_metrics']:
-            MetricsPrinter.print_section("🤖 LLM Reasoning Metrics (Llama 3.1-70B-Instruct)")
-            llm = metrics_data['llm_metrics']
-            MetricsPrinter.print_metric("Model", llm.get('model', 'meta/llama-3.1-70b-instruct'))
-            MetricsPrinter.print_metric("Temperature", llm.get('temperature', 0.3))
-            MetricsPrinter.print_metric("Max Tokens", llm.get('max_tokens', 2048))
-            MetricsPrinter.print_metric("Avg Generation Latency", round(llm.get('avg_latency_ms', 0), 2), "ms")
-            MetricsPrinter.print_metric("Total Responses Generated", llm.get('total_responses', 0))
-            MetricsPrinter.print_metric("Total LLM Time", round(llm.get('total_time_ms', 0), 2), "ms")
-            MetricsPrinter.print_metric("Avg Tokens per Response", round(llm.get('avg_tokens', 0), 1))
+            add("\n⚠️  Note: AI features not available - using standard analysis")
+            add("   To enable AI metrics, install: pip install langchain-nvidia-ai-endpoints langchain-community faiss-cpu")
+            add("   And set NVIDIA_API_KEY in your .env file\n")
         
-        # 4. Detection Performance
-        if 'detection_metrics' in metrics_data:
-            MetricsPrinter.print_section("🎯 Anomaly Detection Performance")
-            det = metrics_data['detection_metrics']
-            MetricsPrinter.print_metric("Total Anomalies Detected", det.get('total_anomalies', 0))
-            MetricsPrinter.print_metric("Authentication Failures", det.get('auth_failures', 0))
-            MetricsPrinter.print_metric("Brute Force Attacks", det.get('brute_force', 0))
-            MetricsPrinter.print_metric("Suspicious Sessions", det.get('suspicious_sessions', 0))
-            MetricsPrinter.print_metric("Resource Misconfigurations", det.get('misconfigurations', 0))
-            MetricsPrinter.print_metric("Security Anomalies", det.get('security_anomalies', 0))
+        # File information and sections 1-4 (embedding, retrieval, LLM, detection)
+        for section_name in MetricsPrinter.LEADING_SECTIONS:
+            section = getattr(metrics, section_name)
+            if section is not None:
+                extend(MetricsPrinter.format_table_section(section_name, section))
         
         # 5. Root Cause Analysis (RCA) Metrics
-        if 'rca_metrics' in metrics_data and metrics_data['rca_metrics']:
-            MetricsPrinter.print_section("🔍 Root Cause Analysis (RCA) Metrics")
-            rca = metrics_data['rca_metrics']
+        rca = metrics.rca
+        if rca is not None:
+            add(MetricsPrinter.SECTION_HEADERS['rca'])
             
             # Core RCA Metrics
-            MetricsPrinter.print_metric("RCA Success Rate", f"{round(rca.get('success_rate', 0) * 100, 1)}%")
-            print(f"    └─ Reports with plausible RCA: {rca.get('reports_with_rca', 0)}/{rca.get('total_reports_analyzed', 0)}")
+            add(MetricsPrinter.format_metric("RCA Success Rate", f"{round(rca.success_rate * 100, 1)}%"))
+            add(f"    └─ Reports with plausible RCA: {rca.reports_with_rca}/{rca.total_reports_analyzed}")
             
-            MetricsPrinter.print_metric("Avg Correlation Chain Length", round(rca.get('avg_chain_length', 0), 1), "events/anomaly")
-            print(f"    └─ How deep event graph analysis goes")
+            add(MetricsPrinter.format_metric("Avg Correlation Chain Length", round(rca.avg_chain_length, 1), "events/anomaly"))
+            add(f"    └─ How deep event graph analysis goes")
             
-            MetricsPrinter.print_metric("Recommendation Coverage", f"{round(rca.get('recommendation_coverage', 0) * 100, 1)}%")
-            print(f"    └─ {rca.get('recommendations_count', 0)} reports with concrete mitigation steps")
+            add(MetricsPrinter.format_metric("Recommendation Coverage", f"{round(rca.recommendation_coverage * 100, 1)}%"))
+            add(f"    └─ {rca.recommendations_count} reports with concrete mitigation steps")
             
             # Analyst Effort Reduction
-            print(f"\n  💡 Analyst Effort Reduction:")
-            MetricsPrinter.print_metric("  Estimated Effort Reduction", f"{round(rca.get('analyst_effort_reduction_pct', 0), 1)}%")
-            MetricsPrinter.print_metric("  Baseline Investigation Time", round(rca.get('baseline_investigation_time_min', 0), 1), "min/incident")
-            MetricsPrinter.print_metric("  Automated Investigation Time", round(rca.get('automated_investigation_time_min', 0), 1), "min/incident")
-            MetricsPrinter.print_metric("  Time Saved per Incident", round(rca.get('time_saved_per_incident_min', 0), 1), "min")
+            add(f"\n  💡 Analyst Effort Reduction:")
+            add(MetricsPrinter.format_metric("  Estimated Effort Reduction", f"{round(rca.analyst_effort_reduction_pct, 1)}%"))
+            add(MetricsPrinter.format_metric("  Baseline Investigation Time", round(rca.baseline_investigation_time_min, 1), "min/incident"))
+            add(MetricsPrinter.format_metric("  Automated Investigation Time", round(rca.automated_investigation_time_min, 1), "min/incident"))
+            add(MetricsPrinter.format_metric("  Time Saved per Incident", round(rca.time_saved_per_incident_min, 1), "min"))
             
             # Additional Details
-            print(f"\n  📊 RCA Details:")
-            MetricsPrinter.print_metric("  Total Correlated Events", rca.get('total_correlated_events', 0))
-            MetricsPrinter.print_metric("  Avg RCA Generation Time", round(rca.get('avg_generation_time_ms', 0), 2), "ms")
+            add(f"\n  📊 RCA Details:")
+            add(MetricsPrinter.format_metric("  Total Correlated Events", rca.total_correlated_events))
+            add(MetricsPrinter.format_metric("  Avg RCA Generation Time", round(rca.avg_generation_time_ms, 2), "ms"))
         
         # 6. End-to-End System Metrics
-        if 'system_metrics' in metrics_data:
-            MetricsPrinter.print_section("⚡ End-to-End System Metrics")
-            sys_met = metrics_data['system_metrics']
-            MetricsPrinter.print_metric("Total Analysis Time", round(sys_met.get('total_time_ms', 0), 2), "ms")
-            MetricsPrinter.print_metric("File Processing Latency", round(sys_met.get('file_processing_ms', 0), 2), "ms")
-            MetricsPrinter.print_metric("API Response Time", round(sys_met.get('response_time_ms', 0), 2), "ms")
-            MetricsPrinter.print_metric("Memory Usage (estimated)", round(sys_met.get('memory_mb', 0), 1), "MB")
+        sys_met = metrics.system
+        if sys_met is not None:
+            extend(MetricsPrinter.format_table_section('system', sys_met))
             
             # Time breakdown
-            if 'time_breakdown' in sys_met:
-                print(f"\n  ⏱️  Time Breakdown:")
-                breakdown = sys_met['time_breakdown']
-                total = sys_met.get('total_time_ms', 1)
-                for phase, duration in breakdown.items():
-                    percentage = (duration / total) * 100 if total > 0 else 0
-                    print(f"    - {phase:<35} : {round(duration, 2):>8.2f} ms ({round(percentage, 1):>5.1f}%)")
+            if sys_met.time_breakdown:
+                add(f"\n  ⏱️  Time Breakdown:")
+                total = sys_met.total_time_ms
+                extend([f"    - {phase:<35} : {duration:>8.2f} ms ({(duration / total * 100 if total > 0 else 0):>5.1f}%)"
+                        for phase, duration in sys_met.time_breakdown.items()])
         
         # 7. Quality Metrics
-        if 'quality_metrics' in metrics_data:
-            MetricsPrinter.print_section("✨ Quality Metrics")
-            qual = metrics_data['quality_metrics']
-            MetricsPrinter.print_metric("Evidence-Grounding Rate", f"{round(qual.get('evidence_grounding', 0) * 100, 1)}%")
-            MetricsPrinter.print_metric("Explanation Faithfulness", f"{round(qual.get('faithfulness', 0) * 100, 1)}%")
-            MetricsPrinter.print_metric("Retrieval Accuracy", f"{round(qual.get('retrieval_accuracy', 0) * 100, 1)}%")
-            MetricsPrinter.print_metric("Reasoning Accuracy", f"{round(qual.get('reasoning_accuracy', 0) * 100, 1)}%")
+        qual = metrics.quality
+        if qual is not None:
+            extend(MetricsPrinter.format_table_section('quality', qual))
         
-        MetricsPrinter.print_separator()
-        print(f"✅ Analysis Complete - All metrics logged")
-        MetricsPrinter.print_separator()
-        print()
+        add(MetricsPrinter.SEPARATOR)
+        add(f"✅ Analysis Complete - All metrics logged")
+        add(MetricsPrinter.SEPARATOR)
+        add("")
+        return "\n".join(lines) + "\n"